@@ -0,0 +1,78 @@
+"""
+Страницы чтения YaNews под WSGI и под ASGI.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_asgi --server wsgi --output wsgi.json
+    python -m benchmarks.bench_asgi --server asgi --output asgi.json
+    python -m benchmarks.compare wsgi.json asgi.json
+
+В режиме wsgi запросы выполняет тестовый клиент Django из нескольких
+потоков через синхронные представления, в режиме asgi - AsyncClient
+из корутин одного цикла событий через news.async_views.
+"""
+import argparse
+import os
+import random
+
+from benchmarks.bench_news import populate
+from benchmarks.harness import (
+    ROOT, print_result, run_async_load, run_load, save_results,
+    setup_django,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='asgi')
+    parser.add_argument(
+        '--db', default=ROOT / 'benchmarks/data/yanews-asgi.db'
+    )
+    parser.add_argument('--news', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    args = parser.parse_args()
+
+    # Маршруты выбирают представления по настройке при импорте.
+    os.environ['NEWS_ASYNC_VIEWS'] = '1' if args.server == 'asgi' else ''
+    setup_django('ya_news', 'yanews.settings', args.db)
+    populate(args.news, args.comments, args.users, args.seed)
+
+    from django.test import AsyncClient, Client
+    from django.urls import reverse
+
+    from news.models import News
+
+    news_ids = list(News.objects.values_list('pk', flat=True))
+    rng = random.Random(args.seed)
+
+    def detail_url():
+        return reverse('news:detail', args=(rng.choice(news_ids),))
+
+    if args.server == 'asgi':
+        make_client, run = AsyncClient, run_async_load
+    else:
+        make_client, run = Client, run_load
+    endpoints = {
+        'news:home': lambda client, index: client.get(reverse('news:home')),
+        'news:detail': lambda client, index: client.get(detail_url()),
+    }
+    results = {}
+    for name, make_request in endpoints.items():
+        results[name] = run(
+            make_client, make_request, args.requests, args.concurrency
+        )
+        print_result(name, results[name])
+    if args.output:
+        dataset = {
+            'news': args.news, 'comments': args.comments,
+            'users': args.users, 'server': args.server,
+        }
+        save_results(args.output, 'ya_news', dataset, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Чтение страниц новостей YaNews во время записи комментариев.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_db [--journal-mode delete] [--writers 4]
+
+Сначала страницы читаются без записи, затем параллельно с потоками,
+которые создают комментарии. Режим журнала SQLite, режим начала
+транзакций и время жизни соединений задаются параметрами; для каждого
+режима журнала создаётся отдельная база. Ошибки чтения или записи
+(например, «database is locked») считаются провалом: бенчмарк
+завершается с ненулевым кодом.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+from benchmarks.harness import (
+    ROOT, print_result, run_load, save_results, setup_django,
+)
+
+
+def write_comments(news_ids, user_ids, stop, stats, seed):
+    """Создаёт комментарии, пока не установлен stop."""
+    from django.db import OperationalError, connection
+
+    from news.models import Comment
+
+    rng = random.Random(seed)
+    while not stop.is_set():
+        try:
+            Comment.objects.create(
+                news_id=rng.choice(news_ids),
+                author_id=rng.choice(user_ids),
+                text='Комментарий под нагрузкой',
+            )
+            stats['writes'] += 1
+        except OperationalError:
+            stats['errors'] += 1
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--journal-mode', default='wal')
+    parser.add_argument(
+        '--transaction-mode', default='immediate',
+        choices=('deferred', 'immediate', 'exclusive'),
+    )
+    parser.add_argument('--conn-max-age', type=int, default=60)
+    parser.add_argument('--news', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    args = parser.parse_args()
+
+    # Настройки базы читаются из окружения при импорте settings.
+    os.environ['SQLITE_JOURNAL_MODE'] = args.journal_mode
+    os.environ['SQLITE_TRANSACTION_MODE'] = args.transaction_mode
+    os.environ['DB_CONN_MAX_AGE'] = str(args.conn_max_age)
+    setup_django(
+        'ya_news', 'yanews.settings',
+        ROOT / f'benchmarks/data/yanews-{args.journal_mode}.db',
+    )
+
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.test import Client
+    from django.urls import reverse
+
+    from news.models import News
+
+    if not News.objects.exists():
+        call_command(
+            'generate_news', news=args.news, comments=args.comments,
+            users=args.users, seed=args.seed,
+        )
+    news_ids = list(News.objects.values_list('pk', flat=True))
+    user_ids = list(get_user_model().objects.values_list('pk', flat=True))
+    rng = random.Random(args.seed)
+
+    def read_detail(client, index):
+        return client.get(
+            reverse('news:detail', args=(rng.choice(news_ids),))
+        )
+
+    results = {}
+    results['read'] = run_load(
+        Client, read_detail, args.requests, args.concurrency
+    )
+    print_result('read', results['read'])
+
+    stop = threading.Event()
+    stats = [{'writes': 0, 'errors': 0} for _ in range(args.writers)]
+    writers = [
+        threading.Thread(
+            target=write_comments,
+            args=(news_ids, user_ids, stop, stats[index], args.seed + index),
+        )
+        for index in range(args.writers)
+    ]
+    started = time.perf_counter()
+    for writer in writers:
+        writer.start()
+    results['read+write'] = run_load(
+        Client, read_detail, args.requests, args.concurrency
+    )
+    stop.set()
+    for writer in writers:
+        writer.join()
+    duration = time.perf_counter() - started
+    print_result('read+write', results['read+write'])
+    writes = sum(stat['writes'] for stat in stats)
+    errors = sum(stat['errors'] for stat in stats)
+    results['read+write']['writes_per_second'] = writes / duration
+    results['read+write']['write_errors'] = errors
+    print(f'записей {writes / duration:.1f} в секунду, ошибок {errors}')
+    if args.output:
+        dataset = {
+            'news': args.news, 'comments': args.comments,
+            'users': args.users, 'journal_mode': args.journal_mode,
+            'transaction_mode': args.transaction_mode,
+            'conn_max_age': args.conn_max_age, 'writers': args.writers,
+        }
+        save_results(args.output, 'ya_news', dataset, results)
+    failed = (
+        results['read']['errors'] + results['read+write']['errors'] + errors
+    )
+    if failed:
+        sys.exit(f'бенчмарк не пройден: ошибок {failed}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Сравнение фильтра запрещённых слов с проверкой слов по одному.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_moderation [--output results.json]
+"""
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'ya_news'))
+
+from news.moderation import BadWordsFilter  # noqa: E402
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+DICTIONARY_SIZES = (2, 100, 1000, 5000)
+TEXT_LENGTHS = (1000, 10000, 100000)
+REPEATS = 5
+
+
+def random_word(rng, min_length=4, max_length=12):
+    length = rng.randint(min_length, max_length)
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def random_text(rng, length):
+    words = []
+    while sum(map(len, words)) + len(words) < length:
+        words.append(random_word(rng, 2, 10))
+    return ' '.join(words)[:length]
+
+
+def loop_filter(words):
+    """Прежний алгоритм CommentForm.clean_text."""
+    def contains(text):
+        lowered_text = text.lower()
+        for word in words:
+            if word in lowered_text:
+                return True
+        return False
+    return contains
+
+
+def measure(check, text):
+    return min(timeit.repeat(lambda: check(text), number=1, repeat=REPEATS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = []
+    print(f'{"слов":>6} {"символов":>9} {"цикл, мс":>10} '
+          f'{"фильтр, мс":>11} {"ускорение":>10}')
+    for size in DICTIONARY_SIZES:
+        # Слова длиннее слов текста, поэтому совпадений нет
+        # и обе реализации просматривают текст полностью.
+        words = [random_word(rng, 11, 16) for _ in range(size)]
+        compiled = BadWordsFilter(words)
+        loop = loop_filter(words)
+        for length in TEXT_LENGTHS:
+            text = random_text(rng, length)
+            loop_time = measure(loop, text)
+            filter_time = measure(compiled.__contains__, text)
+            results.append({
+                'words': size,
+                'text_length': length,
+                'loop_seconds': loop_time,
+                'filter_seconds': filter_time,
+            })
+            print(f'{size:>6} {length:>9} {loop_time * 1000:>10.3f} '
+                  f'{filter_time * 1000:>11.3f} '
+                  f'{loop_time / filter_time:>9.1f}x')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Нагрузочный бенчмарк YaNews.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_news [--news 100000 --comments 5000000]
+
+Данные генерируются в отдельной базе SQLite при первом запуске
+и переиспользуются в следующих.
+"""
+import argparse
+import random
+
+from benchmarks.harness import (
+    ROOT, print_result, run_load, save_results, setup_django,
+)
+
+
+def populate(news_count, comments_count, users_count, seed):
+    from django.core.management import call_command
+
+    from news.models import News
+
+    if News.objects.exists():
+        return
+    call_command(
+        'generate_news', news=news_count, comments=comments_count,
+        users=users_count, seed=seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default=ROOT / 'benchmarks/data/yanews.db')
+    parser.add_argument('--news', type=int, default=100000)
+    parser.add_argument('--comments', type=int, default=5000000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    args = parser.parse_args()
+
+    setup_django('ya_news', 'yanews.settings', args.db)
+    populate(args.news, args.comments, args.users, args.seed)
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from news.models import News
+
+    news_ids = list(News.objects.values_list('pk', flat=True))
+    user_ids = list(get_user_model().objects.values_list('pk', flat=True))
+    rng = random.Random(args.seed)
+
+    def anonymous_client():
+        return Client()
+
+    def authorized_client():
+        client = Client()
+        client.force_login(
+            get_user_model().objects.get(pk=rng.choice(user_ids))
+        )
+        return client
+
+    def detail_url():
+        return reverse('news:detail', args=(rng.choice(news_ids),))
+
+    endpoints = {
+        'news:home': (
+            anonymous_client,
+            lambda client, index: client.get(reverse('news:home')),
+        ),
+        'news:detail': (
+            anonymous_client,
+            lambda client, index: client.get(detail_url()),
+        ),
+        'news:comments': (
+            anonymous_client,
+            lambda client, index: client.get(reverse(
+                'news:comments', args=(rng.choice(news_ids),)
+            )),
+        ),
+        'news:api_news': (
+            anonymous_client,
+            lambda client, index: client.get(reverse('news:api_news')),
+        ),
+        'news:api_news_detail': (
+            anonymous_client,
+            lambda client, index: client.get(reverse(
+                'news:api_news_detail', args=(rng.choice(news_ids),)
+            )),
+        ),
+        'news:api_comments': (
+            anonymous_client,
+            lambda client, index: client.get(reverse(
+                'news:api_comments', args=(rng.choice(news_ids),)
+            )),
+        ),
+        'comment:post': (
+            authorized_client,
+            lambda client, index: client.post(
+                detail_url(), {'text': f'Комментарий {index}'}
+            ),
+        ),
+    }
+    results = {}
+    for name, (make_client, make_request) in endpoints.items():
+        results[name] = run_load(
+            make_client, make_request, args.requests, args.concurrency
+        )
+        print_result(name, results[name])
+    if args.output:
+        dataset = {
+            'news': args.news, 'comments': args.comments,
+            'users': args.users,
+        }
+        save_results(args.output, 'ya_news', dataset, results)
+
+
+if __name__ == '__main__':
+    main()
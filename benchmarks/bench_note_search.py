@@ -0,0 +1,87 @@
+"""
+Поиск по заметкам YaNote по мере ввода.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_note_search [--notes 1000000 --users 1000]
+
+Для случайных авторов берутся слова их заметок и набираются
+по буквам: каждый префикс - отдельный поисковый запрос, как при
+поиске по мере ввода. Отдельно измеряется автор с наибольшим
+числом заметок. Время включает загрузку найденных заметок.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_notes import populate
+from benchmarks.harness import (
+    ROOT, print_result, save_results, setup_django, summarize,
+)
+
+
+def typed_queries(title, text):
+    """Запросы, которые отправляются, пока набирается заголовок и текст."""
+    words = f'{title} {text}'.split()[:3]
+    queries = []
+    for index, word in enumerate(words):
+        typed = ' '.join(words[:index])
+        for length in range(1, len(word) + 1):
+            queries.append(f'{typed} {word[:length]}'.strip())
+    return queries
+
+
+def measure(author_ids, rng, sessions):
+    from notes.models import Note
+    from notes.search import search
+
+    latencies = []
+    for _ in range(sessions):
+        author_id = rng.choice(author_ids)
+        notes = Note.objects.filter(author_id=author_id)
+        title, text = notes.values_list('title', 'text').order_by('?')[0]
+        for query in typed_queries(title, text):
+            query_started = time.perf_counter()
+            search(notes.only('id', 'title', 'slug', 'text'), author_id, query)
+            latencies.append(time.perf_counter() - query_started)
+    # Выбор заметки в пропускную способность не входит.
+    return summarize(latencies, 0, len(latencies), 1, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default=ROOT / 'benchmarks/data/yanote.db')
+    parser.add_argument('--notes', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    args = parser.parse_args()
+
+    setup_django('ya_note', 'yanote.settings', args.db)
+    populate(args.notes, args.users, args.seed)
+
+    from django.db.models import Count
+
+    from notes.models import Note
+
+    counts = dict(
+        Note.objects.values_list('author_id').annotate(Count('id'))
+    )
+    rng = random.Random(args.seed)
+    results = {}
+    results['typical author'] = measure(list(counts), rng, args.sessions)
+    print_result('typical author', results['typical author'])
+    busiest = max(counts, key=counts.get)
+    results['busiest author'] = measure([busiest], rng, args.sessions // 10)
+    print_result('busiest author', results['busiest author'])
+    print(f'заметок у самого активного автора: {counts[busiest]}')
+    if args.output:
+        dataset = {
+            'notes': args.notes, 'users': args.users,
+            'busiest_author_notes': counts[busiest],
+        }
+        save_results(args.output, 'ya_note', dataset, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Нагрузочный бенчмарк YaNote.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_notes [--notes 1000000 --users 1000]
+
+Данные генерируются в отдельной базе SQLite при первом запуске
+и переиспользуются в следующих.
+"""
+import argparse
+import random
+
+from benchmarks.harness import (
+    ROOT, print_result, run_load, save_results, setup_django,
+)
+
+
+def populate(notes_count, users_count, seed):
+    from django.core.management import call_command
+
+    from notes.models import Note
+
+    if Note.objects.exists():
+        return
+    call_command(
+        'generate_notes', notes=notes_count, users=users_count, seed=seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default=ROOT / 'benchmarks/data/yanote.db')
+    parser.add_argument('--notes', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    args = parser.parse_args()
+
+    setup_django('ya_note', 'yanote.settings', args.db)
+    populate(args.notes, args.users, args.seed)
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from notes.models import Note
+
+    User = get_user_model()
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    rng = random.Random(args.seed)
+
+    def authorized_client():
+        client = Client()
+        client.user = User.objects.get(pk=rng.choice(user_ids))
+        client.force_login(client.user)
+        client.slugs = list(Note.objects.filter(
+            author=client.user
+        ).values_list('slug', flat=True)[:100]) or ['missing']
+        # Курсоры для списка заметок на любой глубине.
+        client.cursors = list(Note.objects.filter(
+            author=client.user
+        ).values_list('pk', flat=True)) or [0]
+        return client
+
+    endpoints = {
+        'notes:list': lambda client, index: client.get(
+            reverse('notes:list'), {'after': rng.choice(client.cursors)}
+        ),
+        'notes:detail': lambda client, index: client.get(
+            reverse('notes:detail', args=(rng.choice(client.slugs),))
+        ),
+        'notes:add': lambda client, index: client.post(
+            reverse('notes:add'), {'title': 'Встреча', 'text': 'Текст'}
+        ),
+    }
+    results = {}
+    for name, make_request in endpoints.items():
+        results[name] = run_load(
+            authorized_client, make_request, args.requests, args.concurrency
+        )
+        print_result(name, results[name])
+    if args.output:
+        dataset = {'notes': args.notes, 'users': args.users}
+        save_results(args.output, 'ya_note', dataset, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Сравнение результатов двух запусков нагрузочного бенчмарка.
+
+Запуск из корня репозитория:
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import json
+
+from benchmarks.harness import PERCENTILES
+
+METRICS = ('rps',) + tuple(f'p{percent}_ms' for percent in PERCENTILES)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('old')
+    parser.add_argument('new')
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    print(f'{(old["commit"] or "?")[:10]} -> {(new["commit"] or "?")[:10]}')
+    for name, new_result in new['endpoints'].items():
+        old_result = old['endpoints'].get(name)
+        if old_result is None:
+            continue
+        changes = '  '.join(
+            f'{metric} {old_result[metric]:.1f} -> {new_result[metric]:.1f}'
+            f' ({(new_result[metric] / old_result[metric] - 1) * 100:+.0f}%)'
+            for metric in METRICS
+        )
+        print(f'{name:<16} {changes}')
+
+
+if __name__ == '__main__':
+    main()
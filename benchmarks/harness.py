@@ -0,0 +1,169 @@
+"""
+Общая часть нагрузочных бенчмарков YaNews и YaNote.
+
+Проект поднимается в текущем процессе с отдельной базой SQLite,
+запросы выполняются тестовым клиентом Django из нескольких потоков.
+"""
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PERCENTILES = (50, 95, 99)
+
+
+def setup_django(project, settings_module, database):
+    """
+    Настраивает Django для проекта project с базой database.
+
+    Миграции применяются к базе, если она ещё не создана.
+    """
+    sys.path.insert(0, str(ROOT / project))
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+
+    import django
+    from django.conf import settings
+
+    Path(database).parent.mkdir(parents=True, exist_ok=True)
+    settings.DATABASES['default']['NAME'] = str(database)
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['*']
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', 'HEAD'), cwd=ROOT, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, percent):
+    """Процентиль методом ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[index]
+
+
+def run_load(make_client, make_request, requests, concurrency):
+    """
+    Выполняет requests запросов в concurrency потоках.
+
+    make_client() создаёт клиента для потока, make_request(client, index)
+    выполняет один запрос и возвращает ответ. Возвращает задержки
+    и пропускную способность.
+    """
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(index):
+        nonlocal errors
+        if not hasattr(local, 'client'):
+            local.client = make_client()
+        start = time.perf_counter()
+        try:
+            response = make_request(local.client, index)
+            failed = response.status_code >= 400
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            errors += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(requests)))
+    duration = time.perf_counter() - started
+
+    from django.db import connections
+
+    connections.close_all()
+    return summarize(latencies, errors, requests, concurrency, duration)
+
+
+def run_async_load(make_client, make_request, requests, concurrency):
+    """
+    То же, что run_load, но запросы выполняются concurrency
+    корутинами в одном цикле событий через ASGI.
+
+    make_request(client, index) возвращает корутину с ответом.
+    """
+    latencies = []
+    errors = 0
+    indexes = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        client = make_client()
+        for index in indexes:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, index)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    async def main():
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    duration = time.perf_counter() - started
+    return summarize(latencies, errors, requests, concurrency, duration)
+
+
+def summarize(latencies, errors, requests, concurrency, duration):
+    result = {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'rps': requests / duration,
+        'mean_ms': statistics.mean(latencies) * 1000,
+    }
+    for percent in PERCENTILES:
+        result[f'p{percent}_ms'] = percentile(latencies, percent) * 1000
+    return result
+
+
+def print_result(name, result):
+    print(
+        f'{name:<16} {result["rps"]:>9.1f} rps  '
+        + '  '.join(
+            f'p{percent} {result[f"p{percent}_ms"]:>8.2f} мс'
+            for percent in PERCENTILES
+        )
+        + f'  ошибок {result["errors"]}'
+    )
+
+
+def save_results(path, project, dataset, results):
+    """Сохраняет результаты в JSON для сравнения между коммитами."""
+    data = {
+        'project': project,
+        'commit': get_git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'dataset': dataset,
+        'endpoints': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
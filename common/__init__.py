@@ -0,0 +1 @@
+"""Модули, общие для YaNews и YaNote."""
@@ -0,0 +1,23 @@
+"""
+SQLite, в котором транзакции начинаются с BEGIN IMMEDIATE.
+
+Транзакция, начатая обычным BEGIN (DEFERRED), берёт снимок базы
+при первом запросе, а блокировку записи - только при первом изменении.
+Если, пока она ждала блокировку, другое соединение записало свои
+изменения, снимок устаревает, и SQLite сразу возвращает «database is
+locked»: busy_timeout здесь не помогает. BEGIN IMMEDIATE берёт
+блокировку записи в начале транзакции, поэтому параллельные
+транзакции по очереди ждут друг друга в пределах busy_timeout.
+
+Режим задаётся ключом TRANSACTION_MODE настроек соединения
+(в Django 5.1 для этого появился OPTIONS['transaction_mode']).
+Вне транзакций запросы выполняются в режиме autocommit, как обычно.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE', 'DEFERRED')
+        self.cursor().execute(f'BEGIN {mode}')
@@ -0,0 +1,92 @@
+"""
+Настройки базы данных YaNews и YaNote из переменных окружения.
+
+DB_ENGINE=sqlite (по умолчанию):
+    SQLITE_PATH - файл базы, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS,
+    SQLITE_MMAP_SIZE (байт) и SQLITE_BUSY_TIMEOUT (мс) задают PRAGMA,
+    которые выполняются при открытии каждого соединения.
+    SQLITE_TRANSACTION_MODE - как начинаются транзакции (immediate
+    по умолчанию, см. common/backends/sqlite3/base.py).
+DB_ENGINE=postgresql:
+    POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, DB_HOST, DB_PORT.
+    В Django 3.2 нет собственного пула соединений: для пула ставится
+    PgBouncer в режиме transaction, и переменная DB_POOLER=pgbouncer
+    отключает серверные курсоры, которые в этом режиме не работают.
+
+Реплика для чтения (только в YaNews) задаётся SQLITE_REPLICA_PATH
+или DB_REPLICA_HOST, остальные параметры у неё те же, что у основной
+базы.
+
+DB_CONN_MAX_AGE - сколько секунд соединение переиспользуется между
+запросами (0 - закрывается после каждого запроса).
+"""
+import os
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+SQLITE_ENGINE = 'common.backends.sqlite3'
+SQLITE_PRAGMAS = (
+    ('journal_mode', 'SQLITE_JOURNAL_MODE', 'wal'),
+    ('synchronous', 'SQLITE_SYNCHRONOUS', 'normal'),
+    ('mmap_size', 'SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)),
+    ('busy_timeout', 'SQLITE_BUSY_TIMEOUT', '5000'),
+)
+
+
+def get_database(base_dir, name):
+    """
+    Настройки соединения default для DATABASES.
+
+    По умолчанию база SQLite лежит в base_dir, а база PostgreSQL
+    называется name.
+    """
+    conn_max_age = int(os.getenv('DB_CONN_MAX_AGE', 60))
+    if os.getenv('DB_ENGINE', 'sqlite') == 'postgresql':
+        return {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', name),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': conn_max_age,
+            'DISABLE_SERVER_SIDE_CURSORS': (
+                os.getenv('DB_POOLER') == 'pgbouncer'
+            ),
+        }
+    return {
+        'ENGINE': SQLITE_ENGINE,
+        'NAME': os.getenv('SQLITE_PATH', base_dir / 'db.sqlite3'),
+        'CONN_MAX_AGE': conn_max_age,
+        'TRANSACTION_MODE': os.getenv(
+            'SQLITE_TRANSACTION_MODE', 'immediate'
+        ).upper(),
+        'PRAGMAS': {
+            pragma: os.getenv(variable, default)
+            for pragma, variable, default in SQLITE_PRAGMAS
+        },
+    }
+
+
+def get_replicas(database):
+    """Соединение replica для DATABASES, если реплика задана."""
+    if database['ENGINE'] == SQLITE_ENGINE:
+        changes = {'NAME': os.getenv('SQLITE_REPLICA_PATH')}
+    else:
+        changes = {'HOST': os.getenv('DB_REPLICA_HOST')}
+    if not all(changes.values()):
+        return {}
+    # В тестах реплика - то же соединение, что и основная база.
+    return {'replica': {**database, **changes, 'TEST': {'MIRROR': 'default'}}}
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    """Выполняет PRAGMA из настроек при открытии соединения с SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    # Напрямую через sqlite3, чтобы PRAGMA не попадали в счётчики
+    # запросов и профилирование.
+    for pragma, value in connection.settings_dict.get('PRAGMAS', {}).items():
+        connection.connection.execute(f'PRAGMA {pragma} = {value}')
@@ -0,0 +1,26 @@
+"""Вспомогательные функции команд generate_news и generate_notes."""
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+
+def zipf_weights(count, skew):
+    """Накопленные веса закона Ципфа: i-й элемент весит 1 / i^skew."""
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def create_users(count, batch_size):
+    """Создаёт count пользователей и возвращает их id."""
+    User = get_user_model()
+    offset = User.objects.count()
+    # Вход под созданными пользователями не нужен.
+    password = make_password(None)
+    User.objects.bulk_create(
+        (User(username=f'user{offset + index}', password=password)
+         for index in range(count)),
+        batch_size=batch_size,
+    )
+    return list(User.objects.filter(
+        username__in=[f'user{offset + index}' for index in range(count)]
+    ).values_list('pk', flat=True))
@@ -0,0 +1,228 @@
+"""
+Метрики YaNews и YaNote в текстовом формате Prometheus.
+
+Значения копятся в словарях отдельных потоков, поэтому запись метрики
+обходится без блокировок. Значения завершившихся потоков переносятся
+в общую сумму процесса, чтобы список словарей не рос вместе с числом
+когда-либо запущенных потоков. Если задан METRICS_DIR, каждый процесс
+периодически сохраняет свои значения в этот каталог, а /metrics
+суммирует файлы всех процессов.
+
+SQL-запросы считает обёртка, которая ставится на каждое соединение
+с БД и пишет в список текущего контекста: так учитываются и запросы
+из потоков, в которых выполняются асинхронные представления.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+_local = threading.local()
+_lock = threading.Lock()
+# Пары (слабая ссылка на поток, значения потока).
+_registries = []
+# Значения завершившихся потоков.
+_retired = {}
+_types = {}
+_process = {'id': uuid.uuid4().hex, 'flushed': time.monotonic()}
+_queries = ContextVar('queries', default=None)
+
+
+def _reset_after_fork():
+    """Дочерний процесс начинает со своих пустых значений."""
+    global _local
+    _local = threading.local()
+    _registries.clear()
+    _retired.clear()
+    _process.update(id=uuid.uuid4().hex, flushed=time.monotonic())
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _count_query(execute, sql, params, many, context):
+    queries = _queries.get()
+    if queries is not None:
+        queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def track_queries():
+    """
+    Начинает подсчёт SQL-запросов в текущем контексте.
+
+    Возвращает список, в который попадают запросы, и токен
+    для stop_tracking_queries().
+    """
+    queries = []
+    return queries, _queries.set(queries)
+
+
+def stop_tracking_queries(token):
+    _queries.reset(token)
+
+
+def _retire_dead_threads():
+    """Переносит значения завершившихся потоков в _retired, держа _lock."""
+    alive = []
+    for thread_ref, values in _registries:
+        thread = thread_ref()
+        if thread is not None and thread.is_alive():
+            alive.append((thread_ref, values))
+            continue
+        for key, value in values.items():
+            _retired[key] = _retired.get(key, 0) + value
+    _registries[:] = alive
+
+
+def _values():
+    values = getattr(_local, 'values', None)
+    if values is None:
+        values = _local.values = {}
+        with _lock:
+            _retire_dead_threads()
+            _registries.append(
+                (weakref.ref(threading.current_thread()), values)
+            )
+    return values
+
+
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value))
+                              for key, value in labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    """Увеличивает счётчик name с метками labels."""
+    _types[name] = 'counter'
+    values = _values()
+    key = _key(name, labels)
+    values[key] = values.get(key, 0) + amount
+
+
+def observe(name, value, buckets, **labels):
+    """Добавляет значение в гистограмму name с границами buckets."""
+    _types[name] = 'histogram'
+    values = _values()
+    name, labels = _key(name, labels)
+    for bound in buckets:
+        key = (f'{name}_bucket', labels + (('le', f'{bound:g}'),))
+        values[key] = values.get(key, 0) + (value <= bound)
+    for key, amount in (
+        ((f'{name}_bucket', labels + (('le', '+Inf'),)), 1),
+        ((f'{name}_sum', labels), value),
+        ((f'{name}_count', labels), 1),
+    ):
+        values[key] = values.get(key, 0) + amount
+
+
+def snapshot():
+    """Сумма значений всех потоков текущего процесса."""
+    with _lock:
+        _retire_dead_threads()
+        registries = [values for thread_ref, values in _registries]
+        total = dict(_retired)
+    for values in registries:
+        for key, value in values.copy().items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def flush():
+    """Сохраняет значения процесса в METRICS_DIR."""
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    _process['flushed'] = time.monotonic()
+    data = {
+        'types': dict(_types),
+        'values': [[name, labels, value]
+                   for (name, labels), value in snapshot().items()],
+    }
+    path = directory / f'{_process["id"]}.json'
+    temporary = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def maybe_flush():
+    """Сохраняет значения, если с прошлого раза прошло достаточно времени."""
+    if (settings.METRICS_DIR and time.monotonic() - _process['flushed']
+            >= settings.METRICS_FLUSH_INTERVAL):
+        flush()
+
+
+def collect():
+    """Значения и типы метрик всех процессов."""
+    if not settings.METRICS_DIR:
+        return snapshot(), dict(_types)
+    flush()
+    total, types = {}, {}
+    for path in Path(settings.METRICS_DIR).glob('*.json'):
+        data = json.loads(path.read_text())
+        types.update(data['types'])
+        for name, labels, value in data['values']:
+            key = name, tuple(map(tuple, labels))
+            total[key] = total.get(key, 0) + value
+    return total, types
+
+
+def _escape(label):
+    return (label.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _sort_key(sample):
+    name, labels, value = sample
+    return name, tuple(
+        (key, float(label) if key == 'le' else label)
+        for key, label in labels
+    )
+
+
+def render(values, types):
+    """Текстовый формат Prometheus."""
+    families = {}
+    for (name, labels), value in values.items():
+        family = name
+        if family not in types:
+            family = name.rsplit('_', 1)[0]
+        families.setdefault(family, []).append((name, labels, value))
+    lines = []
+    for family in sorted(families):
+        lines.append(f'# TYPE {family} {types[family]}')
+        for name, labels, value in sorted(families[family], key=_sort_key):
+            if labels:
+                labels = ','.join(
+                    f'{key}="{_escape(label)}"' for key, label in labels
+                )
+                name = f'{name}{{{labels}}}'
+            lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    return HttpResponse(
+        render(*collect()), content_type='text/plain; version=0.0.4'
+    )
@@ -0,0 +1,199 @@
+"""Middleware профилирования и метрик, общие для YaNews и YaNote."""
+import asyncio
+import cProfile
+import logging
+import random
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from common import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    """Замеры одного запроса: время SQL-запросов и рендеринга шаблонов."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - started, sql))
+
+    @property
+    def db_time(self):
+        return sum(duration for duration, sql in self.queries)
+
+    def slowest_queries(self, count):
+        return sorted(self.queries, key=lambda query: query[0],
+                      reverse=True)[:count]
+
+    def slow_queries(self, threshold):
+        return [(duration, sql) for duration, sql in self.queries
+                if duration >= threshold]
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование запросов.
+
+    Включается настройкой PROFILING_ENABLED. Время обработки, число
+    и время SQL-запросов, число и время запросов дольше
+    PROFILING_SLOW_QUERY_THRESHOLD секунд и время рендеринга шаблона
+    отдаются в заголовке Server-Timing. PROFILING_SLOW_QUERIES самых
+    медленных запросов пишутся в лог: с уровнем WARNING, если запрос
+    дольше порога, иначе INFO.
+    Если задан PROFILING_CPROFILE_DIR, часть запросов
+    (PROFILING_CPROFILE_RATE) выполняется под cProfile, и профиль
+    сохраняется, когда запрос дольше PROFILING_CPROFILE_THRESHOLD секунд.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = profile = RequestProfile()
+        profiler = None
+        if (settings.PROFILING_CPROFILE_DIR
+                and random.random() < settings.PROFILING_CPROFILE_RATE):
+            profiler = cProfile.Profile()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            if profiler is not None:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        total = time.perf_counter() - profile.started
+        slow = profile.slow_queries(settings.PROFILING_SLOW_QUERY_THRESHOLD)
+        slow_time = sum(duration for duration, sql in slow)
+        response['Server-Timing'] = ', '.join((
+            f'app;dur={total * 1000:.1f}',
+            f'db;dur={profile.db_time * 1000:.1f};'
+            f'desc="{len(profile.queries)} queries"',
+            f'slow;dur={slow_time * 1000:.1f};'
+            f'desc="{len(slow)} slow queries"',
+            f'tpl;dur={profile.template_time * 1000:.1f}',
+        ))
+        self.log_slowest_queries(request, profile)
+        if (profiler is not None
+                and total >= settings.PROFILING_CPROFILE_THRESHOLD):
+            self.dump_profile(request, profiler, total)
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def rendered(response):
+            request.profile.template_time += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def log_slowest_queries(request, profile):
+        for duration, sql in profile.slowest_queries(
+            settings.PROFILING_SLOW_QUERIES
+        ):
+            level = logging.INFO
+            if duration >= settings.PROFILING_SLOW_QUERY_THRESHOLD:
+                level = logging.WARNING
+            logger.log(level, '%s %s: %.1f ms %s', request.method,
+                       request.path, duration * 1000, sql)
+
+    @staticmethod
+    def dump_profile(request, profiler, total):
+        directory = Path(settings.PROFILING_CPROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        match = request.resolver_match
+        name = match.view_name if match else 'unresolved'
+        profiler.dump_stats(directory / (
+            f'{time.strftime("%Y%m%d-%H%M%S")}-{request.method}-'
+            f'{name.replace(":", "-")}-{total * 1000:.0f}ms.prof'
+        ))
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Основа middleware, которая работает и в синхронном, и в асинхронном
+    режиме, не занимая поток на время асинхронного запроса.
+
+    Подклассы определяют start(request), возвращающий состояние,
+    и finish(request, response, state); response равен None, если
+    обработка запроса завершилась исключением.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как в django.utils.deprecation.MiddlewareMixin.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        state = self.start(request)
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            self.finish(request, response, state)
+        return response
+
+    async def __acall__(self, request):
+        state = self.start(request)
+        response = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.finish(request, response, state)
+        return response
+
+
+class MetricsMiddleware(SyncAndAsyncMiddleware):
+    """
+    Метрики запросов: число, время обработки и число SQL-запросов
+    по именам URL. Отключается настройкой METRICS_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def start(self, request):
+        return time.perf_counter(), *metrics.track_queries()
+
+    def finish(self, request, response, state):
+        started, queries, token = state
+        metrics.stop_tracking_queries(token)
+        if response is None:
+            return
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        metrics.inc('http_requests_total', view=view, method=request.method,
+                    status=response.status_code)
+        metrics.observe('http_request_duration_seconds', duration,
+                        metrics.LATENCY_BUCKETS, view=view)
+        metrics.observe('db_queries_per_request', len(queries),
+                        metrics.QUERY_BUCKETS, view=view)
+        metrics.maybe_flush()
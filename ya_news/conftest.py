@@ -1,11 +1,19 @@
 import pytest
 from datetime import timedelta
+from django.core.cache import cache
 from django.utils import timezone
 
 from news.models import News, Comment
 
 NUMBER_OF_NEWS = 11
 NUMBER_OF_COMMENTS = 2
+# Объёмы данных, на которых проверяется число запросов представлений.
+QUERY_BUDGET_SIZES = (1, 10, 1000)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
 
 
 @pytest.fixture
@@ -71,3 +79,37 @@ def comments_count(news, comment, author):
         )
         comment.created = timezone.now() + timedelta(days=1)
         comment.save()
+
+
+@pytest.fixture
+def pk_for_args(news):
+    return (news.pk,)
+
+
+@pytest.fixture
+def comment_pk_for_args(comment):
+    return (comment.pk,)
+
+
+@pytest.fixture(params=QUERY_BUDGET_SIZES)
+def news_with_comments(request, news, django_user_model):
+    """
+    Новость с комментариями разных авторов и столько же других новостей.
+
+    Число строк задаётся параметром фикстуры.
+    """
+    size = request.param
+    django_user_model.objects.bulk_create(
+        django_user_model(username=f'Читатель {index}')
+        for index in range(size)
+    )
+    users = django_user_model.objects.filter(username__startswith='Читатель')
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text=f'Текст {index}')
+        for index in range(size)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=news, author=user, text=f'Комментарий {index}')
+        for index, user in enumerate(users)
+    )
+    return news
@@ -0,0 +1,167 @@
+"""
+JSON API для чтения новостей и комментариев.
+
+Объекты моделей не создаются: из БД выбираются только запрошенные
+поля (?fields=id,title), строки сразу превращаются в словари
+и сериализуются. Списки листаются курсорами по ключу, как лента
+комментариев на странице новости, ответы сжимаются gzip.
+"""
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import generic
+from django.views.decorators.gzip import gzip_page
+
+from .models import Comment, News
+from .pagination import (
+    comments_after, encode_cursor, encode_news_cursor, news_after,
+)
+
+# Имя поля в API: поле модели для values_list().
+NEWS_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'teaser': 'teaser',
+    'text': 'text',
+    'date': 'date',
+    'comment_count': 'comment_count',
+    'modified': 'modified',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'author': 'author__username',
+    'text': 'text',
+    'created': 'created',
+}
+
+
+class ApiError(Exception):
+    """Ошибка в параметрах запроса, отдаётся с кодом 400."""
+
+
+@method_decorator(gzip_page, name='dispatch')
+class ApiView(generic.View):
+    """
+    Общая часть представлений API.
+
+    fields - поля, которые можно запросить, default_fields - поля
+    ответа, если параметр fields не указан.
+    """
+    fields = {}
+    default_fields = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return self.json({'error': str(error)}, status=400)
+        except Http404:
+            return self.json({'error': 'Не найдено.'}, status=404)
+
+    @staticmethod
+    def json(data, status=200):
+        return JsonResponse(
+            data, status=status, json_dumps_params={'ensure_ascii': False}
+        )
+
+    def get_fields(self):
+        """Запрошенные поля в порядке запроса."""
+        value = self.request.GET.get('fields')
+        if value is None:
+            return list(self.default_fields)
+        names = list(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise ApiError(
+                'Неизвестные поля: ' + ', '.join(unknown) + '. '
+                'Доступны: ' + ', '.join(self.fields) + '.'
+            )
+        return names
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get(
+                'limit', settings.API_DEFAULT_LIMIT
+            ))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.API_MAX_LIMIT:
+            raise ApiError(
+                f'limit должен быть числом от 1 до {settings.API_MAX_LIMIT}.'
+            )
+        return limit
+
+    def get_page(self, get_queryset, keys, encode):
+        """
+        Ответ со страницей списка и курсором следующей страницы.
+
+        get_queryset(cursor) возвращает упорядоченный по ключу keys
+        QuerySet; поля ключа выбираются для курсора, даже если
+        их не запросили, и в ответ тогда не попадают.
+        """
+        names = self.get_fields()
+        limit = self.get_limit()
+        try:
+            queryset = get_queryset(self.request.GET.get('after'))
+        except ValueError:
+            raise ApiError('Некорректный курсор.')
+        columns = [self.fields[name] for name in names]
+        columns += [key for key in keys if key not in columns]
+        rows = list(queryset.values_list(*columns)[:limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode(*(rows[-1][columns.index(key)]
+                                   for key in keys))
+        return {
+            'results': [dict(zip(names, row)) for row in rows],
+            'next': next_cursor,
+        }
+
+
+class NewsListApi(ApiView):
+    """Новости от новых к старым."""
+    fields = NEWS_FIELDS
+    default_fields = ('id', 'title', 'teaser', 'date', 'comment_count')
+
+    def get(self, request):
+        return self.json(self.get_page(
+            lambda cursor: news_after(News.objects.all(), cursor),
+            ('date', 'id'), encode_news_cursor,
+        ))
+
+
+class NewsDetailApi(ApiView):
+    """Новость полностью."""
+    fields = NEWS_FIELDS
+    default_fields = tuple(NEWS_FIELDS)
+
+    def get(self, request, pk):
+        names = self.get_fields()
+        row = News.objects.filter(pk=pk).values_list(
+            *(self.fields[name] for name in names)
+        ).first()
+        if row is None:
+            raise Http404
+        return self.json(dict(zip(names, row)))
+
+
+class CommentListApi(ApiView):
+    """Комментарии к новости от старых к новым."""
+    fields = COMMENT_FIELDS
+    default_fields = tuple(COMMENT_FIELDS)
+
+    def get(self, request, pk):
+        page = self.get_page(
+            lambda cursor: comments_after(
+                Comment.objects.filter(news_id=pk), cursor
+            ),
+            ('created', 'id'), encode_cursor,
+        )
+        # Существование новости проверяется, только если
+        # комментариев нет.
+        if not page['results'] and not News.objects.filter(pk=pk).exists():
+            raise Http404
+        return self.json(page)
@@ -0,0 +1,61 @@
+"""
+Асинхронные версии страниц чтения новостей и API для запуска под ASGI.
+
+В Django 3.2 нет асинхронного ORM, поэтому синхронное представление
+вместе с рендерингом шаблона выполняется в пуле из NEWS_ASYNC_THREADS
+потоков. Пока запрос ждёт пула, он не занимает поток сервера.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .api import CommentListApi, NewsDetailApi, NewsListApi
+from .views import NewsDetailView, NewsList
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.NEWS_ASYNC_THREADS, thread_name_prefix='news-async'
+)
+
+
+def run_view(view, request, *args, **kwargs):
+    """
+    Выполняет синхронное представление в потоке пула.
+
+    Шаблон рендерится здесь же: при рендеринге могут выполняться
+    запросы к БД. Соединения потока закрываются так же, как в начале
+    и в конце синхронного запроса, с учётом CONN_MAX_AGE.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def as_async(view):
+    """Асинхронная обёртка синхронного представления view."""
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        # Контекст копируется, чтобы в потоке действовали переменные
+        # контекста запроса, например выбор реплики.
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(
+                context.run, run_view, view, request, *args, **kwargs
+            )
+        )
+    return async_view
+
+
+news_list = as_async(NewsList.as_view())
+news_detail = as_async(NewsDetailView.as_view())
+api_news = as_async(NewsListApi.as_view())
+api_news_detail = as_async(NewsDetailApi.as_view())
+api_comments = as_async(CommentListApi.as_view())
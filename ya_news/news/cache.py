@@ -0,0 +1,100 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from common import metrics
+
+HOME_VERSION_KEY = 'news:home:version'
+# Увеличивается при изменении шаблона news/comment_body.html, чтобы
+# не показывать комментарии, отрендеренные по старому шаблону.
+COMMENT_BODY_VERSION = 1
+
+
+def get_cache():
+    return caches[settings.NEWS_CACHE_ALIAS]
+
+
+def get_home_version():
+    """
+    Текущая версия содержимого главной страницы.
+
+    Если ключ версии вытеснен из кэша, новая версия берётся от текущего
+    времени и не совпадёт ни с одной из прежних версий.
+    """
+    cache = get_cache()
+    version = cache.get(HOME_VERSION_KEY)
+    if version is None:
+        cache.add(HOME_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(HOME_VERSION_KEY)
+    return version
+
+
+def bump_home_version():
+    """
+    Делает недействительным закэшированный список новостей.
+
+    Вызывается через transaction.on_commit(): если сменить версию
+    до фиксации транзакции, параллельный запрос может прочитать новую
+    версию, но ещё старые строки, и закэшировать под новым ключом
+    устаревший HTML.
+    """
+    cache = get_cache()
+    try:
+        cache.incr(HOME_VERSION_KEY)
+    except ValueError:
+        cache.set(HOME_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_home_html(render):
+    """HTML списка новостей из кэша; при промахе вызывается render()."""
+    cache = get_cache()
+    key = f'news:home:{get_home_version()}'
+    html = cache.get(key)
+    if html is None:
+        metrics.inc('cache_requests_total', cache='news_home', result='miss')
+        html = render()
+        cache.set(key, html, settings.NEWS_HOME_CACHE_TIMEOUT)
+    else:
+        metrics.inc('cache_requests_total', cache='news_home', result='hit')
+    return mark_safe(html)
+
+
+def comment_body_key(comment):
+    return (
+        f'news:comment:{COMMENT_BODY_VERSION}:{comment.pk}:'
+        f'{comment.modified.timestamp()}'
+    )
+
+
+def add_comment_bodies(comments):
+    """
+    Добавляет комментариям атрибут body_html с HTML их текста.
+
+    HTML берётся из кэша одним запросом по ключам из id и времени
+    изменения комментария; недостающие комментарии рендерятся
+    и сохраняются в кэш тоже одним запросом. Ссылки на редактирование
+    и удаление зависят от пользователя и в кэш не попадают.
+    """
+    if not comments:
+        return
+    cache = get_cache()
+    keys = [comment_body_key(comment) for comment in comments]
+    cached = cache.get_many(keys)
+    missing = {}
+    template = None
+    for key, comment in zip(keys, comments):
+        if key not in cached:
+            template = template or get_template('news/comment_body.html')
+            missing[key] = template.render({'comment': comment})
+    if missing:
+        cache.set_many(missing, settings.NEWS_COMMENT_CACHE_TIMEOUT)
+        metrics.inc('cache_requests_total', len(missing),
+                    cache='news_comment', result='miss')
+    if cached:
+        metrics.inc('cache_requests_total', len(cached),
+                    cache='news_comment', result='hit')
+    for key, comment in zip(keys, comments):
+        comment.body_html = mark_safe(cached.get(key) or missing[key])
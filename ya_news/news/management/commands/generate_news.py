@@ -0,0 +1,103 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from common.generate import create_users, zipf_weights
+
+from news.models import Comment, News
+
+BATCH_SIZE = 5000
+SENTENCES = (
+    'Сенсационные новости на просторах Интернета.',
+    'Студенты создали мобильное приложение.',
+    'Выпускники победили в конкурсе на самый страшный рассказ.',
+    'Учёные выяснили, что программисты пьют слишком много кофе.',
+    'В городе открылась новая библиотека.',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт пользователей, новости и комментарии для бенчмарков '
+        'и оценки нагрузки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--news', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.0,
+            help=(
+                'Показатель закона Ципфа для числа комментариев у новостей: '
+                '0 - равномерно, больше - больше комментариев у первых '
+                'новостей.'
+            ),
+        )
+        parser.add_argument('--days', type=int, default=3650,
+                            help='Разброс дат новостей в днях.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        user_ids = create_users(options['users'], batch_size)
+        news_ids = self.create_news(
+            options['news'], options['days'], batch_size, rng
+        )
+        if news_ids and user_ids:
+            self.create_comments(
+                options['comments'], news_ids, user_ids,
+                options['skew'], batch_size, rng,
+            )
+        self.stdout.write(
+            f'Создано пользователей: {len(user_ids)}, '
+            f'новостей: {len(news_ids)}, комментариев: '
+            f'{options["comments"] if news_ids and user_ids else 0} '
+            f'за {time.perf_counter() - started:.1f} с.'
+        )
+
+    def create_news(self, count, days, batch_size, rng):
+        last_pk = News.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        today = date.today()
+
+        def make_news(index):
+            return News(
+                title=f'Новость {last_pk + index + 1}',
+                text=' '.join(rng.choices(SENTENCES, k=rng.randint(3, 30))),
+                date=today - timedelta(days=rng.randint(0, days)),
+            )
+
+        with transaction.atomic():
+            News.objects.bulk_create(
+                (make_news(index) for index in range(count)),
+                batch_size=batch_size,
+            )
+        return list(News.objects.filter(pk__gt=last_pk).values_list(
+            'pk', flat=True
+        ))
+
+    def create_comments(self, count, news_ids, user_ids, skew, batch_size,
+                        rng):
+        # Самые обсуждаемые новости выбираются случайно.
+        news_ids = rng.sample(news_ids, len(news_ids))
+        weights = zipf_weights(len(news_ids), skew)
+        with transaction.atomic():
+            for start in range(0, count, batch_size):
+                size = min(batch_size, count - start)
+                targets = rng.choices(news_ids, cum_weights=weights, k=size)
+                Comment.objects.bulk_create(
+                    Comment(news_id=news_id, author_id=rng.choice(user_ids),
+                            text=f'Комментарий {start + index}')
+                    for index, news_id in enumerate(targets)
+                )
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.15 on 2026-10-18 02:31
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+TEASER_WORDS = 15
+BATCH_SIZE = 1000
+
+
+def fill_teaser(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    db_alias = schema_editor.connection.alias
+    batch = []
+    for news in News.objects.using(db_alias).only('id', 'text').iterator(BATCH_SIZE):
+        news.teaser = Truncator(news.text).words(TEASER_WORDS, truncate=' …')
+        batch.append(news)
+        if len(batch) == BATCH_SIZE:
+            News.objects.using(db_alias).bulk_update(batch, ['teaser'])
+            batch = []
+    News.objects.using(db_alias).bulk_update(batch, ['teaser'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='teaser',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_teaser, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 3.2.15 on 2026-10-18 03:05
+
+from django.db import migrations
+
+# SQLite: таблицы FTS5 с внешним содержимым, их синхронизируют
+# триггеры. В индекс попадает текст с «ё», заменённой на «е»:
+# токенизатор unicode61 не считает их одной буквой.
+SQLITE_TABLES = (
+    ('news_news', 'news_news_fts', ('title', 'text')),
+    ('news_comment', 'news_comment_fts', ('text',)),
+)
+SQLITE_TOKENIZER = 'unicode61 remove_diacritics 2'
+# PostgreSQL: GIN-индексы по выражениям, которые повторяет news.search.
+POSTGRESQL_INDEXES = (
+    ('news_news', 'news_news_search_idx',
+     "to_tsvector('russian', title || ' ' || text)"),
+    ('news_comment', 'news_comment_search_idx',
+     "to_tsvector('russian', text)"),
+)
+
+
+def normalized(columns, prefix=''):
+    return ', '.join(
+        f"replace(replace({prefix}{column}, 'ё', 'е'), 'Ё', 'Е')"
+        for column in columns
+    )
+
+
+def sqlite_triggers(table, fts, columns):
+    names = ', '.join(columns)
+    insert = (
+        f'INSERT INTO {fts}(rowid, {names}) '
+        f'VALUES (new.id, {normalized(columns, "new.")});'
+    )
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {normalized(columns, 'old.')});"
+    )
+    return (
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete} END',
+        # Счётчик комментариев и время изменения новости меняются
+        # часто, поэтому триггер срабатывает только на текстовые поля.
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete} {insert} END',
+    )
+
+
+def sqlite_statements(table, fts, columns):
+    names = ', '.join(columns)
+    return (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='{SQLITE_TOKENIZER}')",
+        f'INSERT INTO {fts}(rowid, {names}) '
+        f'SELECT id, {normalized(columns)} FROM {table}',
+    ) + sqlite_triggers(table, fts, columns)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table, fts, columns in SQLITE_TABLES:
+            for statement in sqlite_statements(table, fts, columns):
+                schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        for table, index, expression in POSTGRESQL_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX {index} ON {table} USING GIN ({expression})'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table, fts, columns in SQLITE_TABLES:
+            for action in ('insert', 'delete', 'update'):
+                schema_editor.execute(f'DROP TRIGGER {fts}_{action}')
+            schema_editor.execute(f'DROP TABLE {fts}')
+    elif vendor == 'postgresql':
+        for table, index, expression in POSTGRESQL_INDEXES:
+            schema_editor.execute(f'DROP INDEX {index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_news_modified'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.15 on 2026-10-18 06:40
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+search_migration = import_module('news.migrations.0006_search')
+
+
+def copy_created(apps, schema_editor):
+    """Существующие комментарии считаются не изменёнными с создания."""
+    Comment = apps.get_model('news', 'Comment')
+    Comment.objects.using(schema_editor.connection.alias).update(
+        modified=models.F('created')
+    )
+
+
+def restore_search_triggers(apps, schema_editor):
+    """
+    SQLite добавляет поле, пересоздавая таблицу news_comment, и триггеры
+    поиска из 0006_search удаляются вместе со старой таблицей.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, fts, columns in search_migration.SQLITE_TABLES:
+        if table != 'news_comment':
+            continue
+        for action in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{action}')
+        for statement in search_migration.sqlite_triggers(
+                table, fts, columns):
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_search'),
+    ]
+
+    # При откате таблица пересоздаётся снова, уже при удалении поля,
+    # поэтому триггеры восстанавливаются последней операцией отката.
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+        migrations.RunPython(copy_created, migrations.RunPython.noop),
+    ]
@@ -1,37 +1,152 @@
+from collections import Counter
 from datetime import datetime
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from common import metrics
+
+from .cache import bump_home_version
+
+TEASER_WORDS = 15
+
+
+def make_teaser(text):
+    """Анонс новости: первые TEASER_WORDS слов текста."""
+    return Truncator(text).words(TEASER_WORDS, truncate=' …')
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Заполняет анонсы, как News.save. Одинаковые тексты
+        обрезаются один раз.
+        """
+        objs = list(objs)
+        teasers = {}
+        for news in objs:
+            if news.text not in teasers:
+                teasers[news.text] = make_teaser(news.text)
+            news.teaser = teasers[news.text]
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def recount_comments(self):
+        """
+        Исправляет расхождения счётчика комментариев с реальным числом.
+
+        Возвращает количество исправленных новостей.
+        """
+        drifted = list(
+            self.order_by().only('id', 'comment_count').annotate(
+                actual_count=Count('comment')
+            ).exclude(comment_count=F('actual_count'))
+        )
+        now = timezone.now()
+        for news in drifted:
+            news.comment_count = news.actual_count
+            news.modified = now
+        self.model.objects.bulk_update(
+            drifted, ['comment_count', 'modified']
+        )
+        if drifted:
+            transaction.on_commit(bump_home_version, using=self.db)
+        return len(drifted)
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
+    teaser = models.TextField(blank=True, editable=False)
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Меняется и при изменении комментариев к новости.
+    modified = models.DateTimeField(auto_now=True)
+
+    objects = NewsQuerySet.as_manager()
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date', 'id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Анонс хранится отдельно, чтобы список новостей
+        # не загружал полный текст.
+        self.teaser = make_teaser(self.text)
+        super().save(*args, **kwargs)
+
+
+class CommentQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Массовое создание комментариев с обновлением счётчиков."""
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            news_ids = Counter(comment.news_id for comment in objs)
+            if kwargs.get('ignore_conflicts'):
+                # Неизвестно, какие строки действительно были вставлены.
+                # recount_comments сам сбросит кэш главной, если счётчики
+                # изменились.
+                News.objects.filter(pk__in=news_ids).recount_comments()
+            else:
+                increments = {}
+                for news_id, count in news_ids.items():
+                    increments.setdefault(count, []).append(news_id)
+                for count, ids in increments.items():
+                    News.objects.filter(pk__in=ids).update(
+                        comment_count=F('comment_count') + count,
+                        modified=timezone.now(),
+                    )
+                transaction.on_commit(bump_home_version, using=self.db)
+        metrics.inc('comment_writes_total', len(objs), action='created')
+        return objs
+
 
 class Comment(models.Model):
+    # Отдельные индексы по внешним ключам не нужны: их заменяют
+    # составные индексы из Meta.indexes.
     news = models.ForeignKey(
         News,
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False,
     )
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    # Входит в ключ закэшированного HTML комментария.
+    modified = models.DateTimeField(auto_now=True)
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_idx'
+            ),
+            models.Index(fields=('author', 'id'), name='comment_author_idx'),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+    def save(self, *args, **kwargs):
+        # Счётчик в News обновляется обработчиком post_save
+        # в той же транзакции, что и сам комментарий.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
@@ -0,0 +1,88 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+
+def build_pattern(words):
+    """
+    Регулярное выражение, совпадающее с любым из слов.
+
+    Слова собираются в префиксное дерево, и выражение повторяет его
+    структуру: общие префиксы проверяются один раз, поэтому в каждой
+    позиции текста движок перебирает не все слова словаря, а только
+    ветви дерева, совпадающие с очередными символами.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def subpattern(node):
+        if list(node) == ['']:
+            return None
+        branches = []
+        chars = []
+        for char in sorted(key for key in node if key):
+            tail = subpattern(node[char])
+            if tail is None:
+                chars.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + tail)
+        if chars:
+            branches.append(
+                chars[0] if len(chars) == 1 else f'[{"".join(chars)}]'
+            )
+        pattern = (
+            branches[0] if len(branches) == 1
+            else f'(?:{"|".join(branches)})'
+        )
+        if '' in node:
+            # Слово закончилось, но есть и более длинные слова.
+            pattern = f'(?:{pattern})?'
+        return pattern
+
+    if not trie:
+        return re.compile(r'(?!)')
+    return re.compile(subpattern(trie))
+
+
+class BadWordsFilter:
+    """
+    Поиск запрещённых слов в тексте за один проход.
+
+    Весь словарь компилируется в одно регулярное выражение при создании
+    фильтра, поэтому проверка текста не перебирает слова по одному.
+    """
+
+    def __init__(self, words):
+        self.pattern = build_pattern(
+            {word.strip().lower() for word in words if word.strip()}
+        )
+
+    def find(self, text):
+        """Первое найденное запрещённое слово или None."""
+        match = self.pattern.search(text.lower())
+        return match.group() if match else None
+
+    def __contains__(self, text):
+        return self.find(text) is not None
+
+
+@lru_cache(maxsize=None)
+def get_bad_words_filter():
+    """
+    Фильтр, собранный один раз на процесс.
+
+    К словам из news.forms.BAD_WORDS добавляются слова из файла
+    BAD_WORDS_FILE (по одному на строку), если он указан в настройках.
+    """
+    from .forms import BAD_WORDS
+
+    words = list(BAD_WORDS)
+    if settings.BAD_WORDS_FILE:
+        with open(settings.BAD_WORDS_FILE, encoding='utf-8') as file:
+            words.extend(file)
+    return BadWordsFilter(words)
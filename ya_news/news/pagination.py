@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Comment
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Наибольший id, который помещается в 64-битный INTEGER базы.
+MAX_ID = 2 ** 63 - 1
+
+
+def _split_cursor(cursor):
+    """
+    Делит курсор на ключ и id. Id за пределами
+    64-битного диапазона отклоняется с ValueError.
+    """
+    key, pk = map(int, cursor.split('-'))
+    if pk > MAX_ID:
+        raise ValueError(f'id вне допустимого диапазона: {pk}')
+    return key, pk
+
+
+def encode_cursor(created, pk):
+    """Курсор на комментарий: момент создания в микросекундах и id."""
+    microseconds = (created - EPOCH) // timedelta(microseconds=1)
+    return f'{microseconds}-{pk}'
+
+
+def decode_cursor(cursor):
+    """Разбирает курсор, при ошибке формата выбрасывает ValueError."""
+    microseconds, pk = _split_cursor(cursor)
+    try:
+        return EPOCH + timedelta(microseconds=microseconds), pk
+    except OverflowError as error:
+        raise ValueError(str(error)) from error
+
+
+def comments_after(comments, cursor=None):
+    """
+    Комментарии по порядку (created, id), начиная после курсора.
+
+    Выборка по ключу обслуживается индексом (news, created, id),
+    поэтому её стоимость не зависит от того, насколько далеко
+    пролистана лента.
+    """
+    comments = comments.order_by('created', 'id')
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        comments = comments.filter(
+            Q(created__gt=created) | Q(created=created, pk__gt=pk)
+        )
+    return comments
+
+
+def encode_news_cursor(news_date, pk):
+    """Курсор на новость: порядковый номер дня и id."""
+    return f'{news_date.toordinal()}-{pk}'
+
+
+def decode_news_cursor(cursor):
+    """Разбирает курсор, при ошибке формата выбрасывает ValueError."""
+    day, pk = _split_cursor(cursor)
+    try:
+        return date.fromordinal(day), pk
+    except OverflowError as error:
+        raise ValueError(str(error)) from error
+
+
+def news_after(news, cursor=None):
+    """
+    Новости от новых к старым по порядку (-date, id), начиная
+    после курсора. Порядок совпадает с индексом news_date_id_idx.
+    """
+    news = news.order_by('-date', 'id')
+    if cursor:
+        news_date, pk = decode_news_cursor(cursor)
+        news = news.filter(
+            Q(date__lt=news_date) | Q(date=news_date, pk__gt=pk)
+        )
+    return news
+
+
+def get_comments_page(news_id, cursor=None, limit=None):
+    """Возвращает порцию комментариев к новости и курсор следующей порции."""
+    if limit is None:
+        limit = settings.COMMENTS_COUNT_ON_DETAIL_PAGE
+    comments = list(comments_after(
+        Comment.objects.filter(news_id=news_id).select_related('author'),
+        cursor,
+    )[:limit + 1])
+    if len(comments) > limit:
+        last = comments[limit - 1]
+        return comments[:limit], encode_cursor(last.created, last.pk)
+    return comments, None
@@ -0,0 +1,175 @@
+import gzip
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import Comment, News
+
+
+@pytest.fixture
+def many_news():
+    """Пять новостей за два дня: по дате и id порядок известен заранее."""
+    today = timezone.now().date()
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text=f'Текст {index}',
+             date=today - timedelta(days=index // 3))
+        for index in range(5)
+    )
+    return list(News.objects.all())
+
+
+@pytest.fixture
+def many_comments(news, author):
+    now = timezone.now()
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(5)
+    )
+    # Время создания одинаковое у пар комментариев.
+    for index, comment in enumerate(Comment.objects.order_by('id')):
+        comment.created = now + timedelta(seconds=index // 2)
+        comment.save(update_fields=('created',))
+
+
+def get_json(client, name, args=None, **params):
+    response = client.get(reverse(name, args=args), params)
+    assert response['Content-Type'] == 'application/json'
+    return response.status_code, response.json()
+
+
+def get_all(client, name, args=None, **params):
+    """Все страницы списка по курсорам."""
+    results = []
+    cursor = None
+    while True:
+        if cursor:
+            params['after'] = cursor
+        status, data = get_json(client, name, args, **params)
+        assert status == HTTPStatus.OK
+        results += data['results']
+        cursor = data['next']
+        if cursor is None:
+            return results
+
+
+@pytest.mark.django_db
+def test_news_list(client, many_news):
+    """Новости от новых к старым, при равной дате - по id."""
+    status, data = get_json(client, 'news:api_news')
+    assert status == HTTPStatus.OK
+    assert data['next'] is None
+    expected = sorted(many_news, key=lambda news: (-news.date.toordinal(),
+                                                   news.pk))
+    assert [item['id'] for item in data['results']] == [
+        news.pk for news in expected
+    ]
+    assert set(data['results'][0]) == {
+        'id', 'title', 'teaser', 'date', 'comment_count'
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('limit', (1, 2, 4))
+def test_news_list_cursor(client, many_news, limit):
+    """При листании курсором новости не теряются и не повторяются."""
+    status, data = get_json(client, 'news:api_news', limit=5)
+    assert get_all(client, 'news:api_news', limit=limit) == data['results']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('limit', (1, 2, 3))
+def test_comments_cursor(client, news, many_comments, limit):
+    """Комментарии от старых к новым, при равном времени - по id."""
+    results = get_all(client, 'news:api_comments', (news.pk,), limit=limit)
+    assert [item['id'] for item in results] == [
+        comment.pk for comment in Comment.objects.order_by('created', 'id')
+    ]
+    assert results[0]['author'] == 'Автор'
+
+
+@pytest.mark.django_db
+def test_news_detail(client, news):
+    news.refresh_from_db()
+    status, data = get_json(client, 'news:api_news_detail', (news.pk,))
+    assert status == HTTPStatus.OK
+    assert data['id'] == news.pk
+    assert data['text'] == news.text
+    assert data['date'] == news.date.isoformat()
+
+
+@pytest.mark.django_db
+def test_sparse_fields(client, news, comment):
+    """Отдаются только запрошенные поля, в порядке запроса."""
+    status, data = get_json(client, 'news:api_news', fields='title,id')
+    assert list(data['results'][0]) == ['title', 'id']
+    status, data = get_json(client, 'news:api_news_detail', (news.pk,),
+                            fields='text')
+    assert data == {'text': news.text}
+    status, data = get_json(client, 'news:api_comments', (news.pk,),
+                            fields='text', limit=1)
+    assert data == {'results': [{'text': comment.text}], 'next': None}
+
+
+@pytest.mark.django_db
+def test_sparse_fields_limit_columns(client, news, comment,
+                                     django_assert_num_queries):
+    """Незапрошенные поля не выбираются из БД, автор - без JOIN."""
+    with django_assert_num_queries(1) as context:
+        client.get(reverse('news:api_comments', args=(news.pk,)),
+                   {'fields': 'id'})
+    sql = context.captured_queries[0]['sql']
+    assert 'text' not in sql
+    assert 'auth_user' not in sql
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'params',
+    (
+        {'fields': 'title,password'},
+        {'fields': ','},
+        {'limit': '0'},
+        {'limit': '1000'},
+        {'limit': 'много'},
+        {'after': 'не-курсор'},
+        {'after': '99999999999-1'},
+        {'after': '1-100000000000000000000'},
+    )
+)
+def test_bad_params(client, news, params):
+    status, data = get_json(client, 'news:api_news', **params)
+    assert status == HTTPStatus.BAD_REQUEST
+    assert 'error' in data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'cursor', ('100000000000000000000-1', '1-100000000000000000000')
+)
+def test_bad_comments_cursor(client, news, cursor):
+    status, data = get_json(client, 'news:api_comments', (news.pk,),
+                            after=cursor)
+    assert status == HTTPStatus.BAD_REQUEST
+    assert 'error' in data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ('news:api_news_detail', 'news:api_comments'))
+def test_missing_news(client, name):
+    status, data = get_json(client, name, (1,))
+    assert status == HTTPStatus.NOT_FOUND
+    assert 'error' in data
+
+
+@pytest.mark.django_db
+def test_gzip(client, many_news):
+    response = client.get(
+        reverse('news:api_news'), HTTP_ACCEPT_ENCODING='gzip'
+    )
+    assert response['Content-Encoding'] == 'gzip'
+    data = json.loads(gzip.decompress(response.content))
+    assert len(data['results']) == len(many_news)
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncClient
+from django.urls import reverse
+
+from common import metrics
+from news.async_views import as_async, api_news, news_detail, news_list
+
+
+@pytest.fixture
+def anonymous_request(rf):
+    def make_request(path):
+        request = rf.get(path)
+        request.user = AnonymousUser()
+        return request
+    return make_request
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_news_list(anonymous_request, news):
+    """Асинхронный список новостей отдаёт отрендеренную страницу."""
+    response = async_to_sync(news_list)(anonymous_request('/'))
+    assert response.status_code == 200
+    assert response.is_rendered
+    assert news.title in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_news_detail(anonymous_request, news):
+    """Асинхронная страница новости отдаёт отрендеренную страницу."""
+    response = async_to_sync(news_detail)(
+        anonymous_request(f'/news/{news.pk}/'), pk=news.pk
+    )
+    assert response.status_code == 200
+    assert news.text in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_api(anonymous_request, news):
+    """Асинхронный API отдаёт JSON."""
+    response = async_to_sync(api_news)(anonymous_request('/api/news/'))
+    assert response.status_code == 200
+    assert json.loads(response.content)['results'][0]['id'] == news.pk
+
+
+@pytest.mark.django_db
+def test_views_run_in_pool(rf):
+    """Синхронный код выполняется в пуле, а не в потоке цикла событий."""
+    def view(request):
+        return threading.current_thread().name
+
+    async def run_concurrently():
+        return await asyncio.gather(
+            *(as_async(view)(rf.get('/')) for _ in range(3))
+        )
+
+    names = async_to_sync(run_concurrently)()
+    assert all(name.startswith('news-async') for name in names)
+
+
+@pytest.mark.django_db
+def test_middleware_under_asgi(news):
+    """Под ASGI метрики учитывают запросы и SQL-запросы."""
+    key = metrics._key('db_queries_per_request_count', {'view': 'news:home'})
+    before = metrics.snapshot().get(key, 0)
+
+    async def get_home():
+        return await AsyncClient().get(reverse('news:home'))
+
+    assert async_to_sync(get_home)().status_code == 200
+    assert metrics.snapshot()[key] == before + 1
@@ -1,9 +1,14 @@
 import pytest
+from http import HTTPStatus
 from django.conf import settings
+from django.db import transaction
+from django.test import override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
+from news.cache import get_home_version
 from news.forms import CommentForm
+from news.models import Comment
 
 User = get_user_model()
 
@@ -62,3 +67,165 @@ def test_authorized_client_has_form(client, news, author):
     response = client.get(reverse('news:detail', args=[news.id]))
     assert 'form' in response.context
     assert isinstance(response.context['form'], CommentForm)
+
+
+@pytest.mark.django_db
+def test_home_page_comment_count(client, news, comments_count,
+                                 django_assert_num_queries):
+    """Количество комментариев на главной странице берётся из счётчика
+    и не требует загрузки самих комментариев."""
+    with django_assert_num_queries(1):
+        response = client.get(reverse('news:home'))
+        object_list = list(response.context['object_list'])
+    assert object_list[0].comment_count == news.comment_set.count()
+
+
+@pytest.mark.django_db
+@override_settings(COMMENTS_COUNT_ON_DETAIL_PAGE=2)
+def test_comments_are_paginated_by_cursor(client, news, author):
+    """На странице новости выводится ограниченное число комментариев,
+    остальные подгружаются порциями по курсору в хронологическом порядке."""
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Текст {index}')
+        for index in range(5)
+    )
+    expected = list(
+        Comment.objects.order_by('created', 'id').values_list('id', flat=True)
+    )
+    response = client.get(reverse('news:detail', args=[news.id]))
+    loaded = [comment.id for comment in response.context['comments']]
+    cursor = response.context['next_cursor']
+    while cursor:
+        response = client.get(
+            reverse('news:comments', args=[news.id]), {'after': cursor}
+        )
+        loaded += [comment.id for comment in response.context['comments']]
+        cursor = response.context['next_cursor']
+    assert loaded == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'cursor',
+    ('abc', '100000000000000000000-1', '1-100000000000000000000')
+)
+def test_invalid_comments_cursor(client, news, cursor):
+    """Некорректный курсор приводит к ошибке 404."""
+    response = client.get(
+        reverse('news:comments', args=[news.id]), {'after': cursor}
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_home_page_shows_teaser(client, news):
+    """На главной странице выводится анонс новости,
+    полный текст из БД не загружается."""
+    news.text = ' '.join(f'слово{index}' for index in range(20))
+    news.save()
+    response = client.get(reverse('news:home'))
+    object_list = list(response.context['object_list'])
+    assert 'text' in object_list[0].get_deferred_fields()
+    assert object_list[0].teaser in response.content.decode()
+    assert 'слово14 …' in object_list[0].teaser
+
+
+@pytest.mark.django_db
+def test_home_page_is_cached(client, news, author,
+                             django_assert_num_queries,
+                             django_capture_on_commit_callbacks):
+    """Повторный запрос главной страницы не обращается к БД,
+    а изменение новостей и комментариев сбрасывает кэш."""
+    client.get(reverse('news:home'))
+    with django_assert_num_queries(0):
+        client.get(reverse('news:home'))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(news=news, author=author, text='Текст')
+    response = client.get(reverse('news:home'))
+    assert 'Комментариев: 1' in response.content.decode()
+
+    news.title = 'Новый заголовок'
+    with django_capture_on_commit_callbacks(execute=True):
+        news.save()
+    response = client.get(reverse('news:home'))
+    assert news.title in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_home_version_changes_after_commit(news, author):
+    """
+    Версия главной страницы меняется только после фиксации транзакции:
+    до неё параллельный запрос закэшировал бы старые данные под новой
+    версией.
+    """
+    version = get_home_version()
+    with transaction.atomic():
+        Comment.objects.create(news=news, author=author, text='Текст')
+        news.delete()
+        assert get_home_version() == version
+    assert get_home_version() != version
+
+
+@pytest.mark.django_db
+def test_detail_conditional_get(client, news, author,
+                                django_assert_num_queries):
+    """Неизменившаяся страница новости отдаётся ответом 304
+    без загрузки комментариев, новый комментарий меняет ETag."""
+    url = reverse('news:detail', args=[news.id])
+    response = client.get(url)
+    etag = response['ETag']
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    Comment.objects.create(news=news, author=author, text='Текст')
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_detail_etag_depends_on_user(client, news, author):
+    """ETag страницы новости у анонимного и авторизованного
+    пользователя различается."""
+    url = reverse('news:detail', args=[news.id])
+    etag = client.get(url)['ETag']
+    client.force_login(author)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Last-Modified' not in response
+
+
+@pytest.mark.django_db
+def test_comment_bodies_are_cached(author_client, news, comment):
+    """HTML комментария берётся из кэша, пока комментарий
+    не изменён, а после редактирования рендерится заново."""
+    url = reverse('news:detail', args=(news.pk,))
+    author_client.get(url)
+    # Обновление через QuerySet не меняет время изменения.
+    Comment.objects.filter(pk=comment.pk).update(text='Текст из базы')
+    response = author_client.get(url)
+    assert 'Текст комментария' in response.content.decode()
+    author_client.post(
+        reverse('news:edit', args=(comment.pk,)), {'text': 'Новый\nтекст'}
+    )
+    response = author_client.get(url)
+    assert 'Новый<br>текст' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_comment_controls_not_cached(client, author, author_1, news,
+                                     comment):
+    """Ссылки на редактирование и удаление видит только автор,
+    даже если HTML комментария закэширован при просмотре другим."""
+    url = reverse('news:detail', args=(news.pk,))
+    edit_url = reverse('news:edit', args=(comment.pk,))
+    client.force_login(author_1)
+    assert edit_url not in client.get(url).content.decode()
+    client.force_login(author)
+    assert edit_url in client.get(url).content.decode()
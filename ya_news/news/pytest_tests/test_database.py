@@ -0,0 +1,106 @@
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client
+from django.urls import reverse
+from http import HTTPStatus
+
+from common.database import get_database
+from news.models import Comment, News
+
+COMMENT_WRITERS = 8
+COMMENTS_TO_WRITE = 200
+
+
+@pytest.fixture
+def file_database(tmp_path, django_db_blocker):
+    """
+    Пул потоков, в которых соединение default - база SQLite в файле.
+
+    Тестовая база в памяти не подходит для проверки параллельной
+    записи: её соединения делят общий кэш и блокируют таблицы целиком.
+    """
+    default = connections[DEFAULT_DB_ALIAS]
+    settings_dict = {
+        **default.settings_dict, 'NAME': str(tmp_path / 'news.db'),
+    }
+    wrappers = []
+
+    def connect():
+        wrapper = default.__class__(settings_dict)
+        wrapper.inc_thread_sharing()
+        wrappers.append(wrapper)
+        connections[DEFAULT_DB_ALIAS] = wrapper
+
+    with django_db_blocker.unblock():
+        with ThreadPoolExecutor(COMMENT_WRITERS, initializer=connect) as pool:
+            pool.submit(call_command, 'migrate', verbosity=0).result()
+            yield pool
+        for wrapper in wrappers:
+            wrapper.close()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('pragma, expected', (
+    ('synchronous', 1),
+    ('busy_timeout', 5000),
+))
+def test_sqlite_pragmas_applied(pragma, expected):
+    """PRAGMA из настроек выполняются при открытии соединения."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {pragma}')
+        assert cursor.fetchone()[0] == expected
+
+
+def test_sqlite_settings_from_env(monkeypatch, tmp_path):
+    """Путь к базе и PRAGMA берутся из переменных окружения."""
+    monkeypatch.setenv('SQLITE_PATH', str(tmp_path / 'news.db'))
+    monkeypatch.setenv('SQLITE_JOURNAL_MODE', 'delete')
+    monkeypatch.setenv('DB_CONN_MAX_AGE', '0')
+    monkeypatch.setenv('SQLITE_TRANSACTION_MODE', 'deferred')
+    database = get_database(tmp_path, 'yanews')
+    assert database['NAME'] == str(tmp_path / 'news.db')
+    assert database['PRAGMAS']['journal_mode'] == 'delete'
+    assert database['TRANSACTION_MODE'] == 'DEFERRED'
+    assert database['CONN_MAX_AGE'] == 0
+
+
+def test_postgresql_behind_pgbouncer(monkeypatch, tmp_path):
+    """За PgBouncer серверные курсоры отключаются."""
+    monkeypatch.setenv('DB_ENGINE', 'postgresql')
+    monkeypatch.setenv('DB_POOLER', 'pgbouncer')
+    database = get_database(tmp_path, 'yanews')
+    assert database['ENGINE'] == 'django.db.backends.postgresql'
+    assert database['DISABLE_SERVER_SIDE_CURSORS'] is True
+    assert database['CONN_MAX_AGE'] == 60
+
+
+def test_concurrent_comments_saved(file_database):
+    """
+    Комментарии, которые одновременно отправляют несколько
+    пользователей, сохраняются без ошибок блокировки базы.
+    """
+    def create_news():
+        user = get_user_model().objects.create(username='Автор')
+        return user, News.objects.create(title='Новость', text='Текст')
+
+    user, news = file_database.submit(create_news).result()
+    url = reverse('news:detail', args=(news.pk,))
+    local = threading.local()
+
+    def post_comment(index):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+            local.client.force_login(user)
+        return local.client.post(url, {'text': f'Комментарий {index}'})
+
+    responses = file_database.map(post_comment, range(COMMENTS_TO_WRITE))
+    assert {response.status_code for response in responses} == {
+        HTTPStatus.FOUND
+    }
+    assert file_database.submit(
+        lambda: (Comment.objects.count(), News.objects.get().comment_count)
+    ).result() == (COMMENTS_TO_WRITE, COMMENTS_TO_WRITE)
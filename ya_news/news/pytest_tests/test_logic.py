@@ -1,9 +1,12 @@
 import pytest
+from io import StringIO
+from django.core.management import call_command
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from http import HTTPStatus
 
-from news.models import Comment
+from news.models import Comment, News
+from news.moderation import get_bad_words_filter
 from news.forms import CommentForm, BAD_WORDS, WARNING
 
 User = get_user_model()
@@ -55,6 +58,26 @@ def test_user_cant_use_bad_words(author_client, news):
     assert comments_count == initial_comments_count
 
 
+@pytest.fixture
+def bad_words_file(settings, tmp_path):
+    path = tmp_path / 'bad_words.txt'
+    path.write_text('мерзавец\nподлец\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = path
+    get_bad_words_filter.cache_clear()
+    yield path
+    get_bad_words_filter.cache_clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('word', (BAD_WORDS[-1], 'ПОДЛЕЦ'))
+def test_bad_words_from_file(author_client, news, bad_words_file, word):
+    """Запрещённые слова загружаются и из файла BAD_WORDS_FILE."""
+    url = reverse('news:detail', args=[news.id])
+    response = author_client.post(url, data={'text': f'Вы {word}!'})
+    assert response.context['form'].errors['text'][0] == WARNING
+    assert not Comment.objects.exists()
+
+
 @pytest.mark.django_db
 def test_authorized_user_can_edit_comment(author_client, comment):
     """Авторизованный пользователь может редактировать свои комментарии."""
@@ -105,3 +128,85 @@ def test_authorized_user_cannot_del_comment_from_another_user(author_client_1,
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert Comment.objects.count() == initial_count
     assert Comment.objects.filter(id=comment.id).exists()
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(author_client, author, news):
+    """Счётчик комментариев новости меняется при добавлении
+    и удалении комментариев, в том числе массовых."""
+    url = reverse('news:detail', args=[news.id])
+    author_client.post(url, {'text': 'Текст комментария'})
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Текст {index}')
+        for index in range(3)
+    )
+    news.refresh_from_db()
+    assert news.comment_count == 4
+
+    comment = Comment.objects.first()
+    author_client.post(reverse('news:delete', args=[comment.id]))
+    news.refresh_from_db()
+    assert news.comment_count == 3
+
+    Comment.objects.all().delete()
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
+@pytest.mark.django_db
+def test_recount_comments_repairs_drift(news, comments_count):
+    """Команда recount_comments исправляет рассинхронизацию счётчиков."""
+    News.objects.update(comment_count=100)
+    call_command('recount_comments', batch_size=1)
+    news.refresh_from_db()
+    assert news.comment_count == Comment.objects.filter(news=news).count()
+
+
+@pytest.mark.django_db
+def test_generate_news_keeps_counters_in_sync(news):
+    """Команда generate_news создаёт данные с верными счётчиками."""
+    call_command('generate_news', users=5, news=20, comments=300,
+                 batch_size=50, seed=1, stdout=StringIO())
+    assert News.objects.count() == 21
+    assert Comment.objects.count() == 300
+    assert News.objects.recount_comments() == 0
+
+
+@pytest.mark.django_db
+def test_news_fixture_loads():
+    """Фикстура с новостями загружается командой loaddata."""
+    call_command('loaddata', 'news.json', verbosity=0)
+    assert News.objects.count() == 19
+    assert not News.objects.filter(teaser='').exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_fills_teaser():
+    """Анонс заполняется и при массовом создании новостей."""
+    text = ' '.join(f'слово{index}' for index in range(20))
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text=text) for index in range(2)
+    )
+    assert set(News.objects.values_list('teaser', flat=True)) == {
+        ' '.join(f'слово{index}' for index in range(15)) + ' …'
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ignore_conflicts', (False, True))
+def test_bulk_create_comments_bumps_home_once(
+    news, author, ignore_conflicts, django_capture_on_commit_callbacks
+):
+    """Массовое создание комментариев сбрасывает кэш главной один раз."""
+    with django_capture_on_commit_callbacks() as callbacks:
+        Comment.objects.bulk_create(
+            (Comment(news=news, author=author, text=f'Текст {index}')
+             for index in range(3)),
+            ignore_conflicts=ignore_conflicts,
+        )
+    assert len(callbacks) == 1
+    news.refresh_from_db()
+    assert news.comment_count == 3
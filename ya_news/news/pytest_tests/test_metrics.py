@@ -0,0 +1,92 @@
+import json
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from common import metrics
+
+HOME_REQUESTS = (
+    'http_requests_total{method="GET",status="200",view="news:home"}'
+)
+HOME_CACHE_HITS = 'cache_requests_total{cache="news_home",result="hit"}'
+COMMENTS_CREATED = 'comment_writes_total{action="created"}'
+
+
+def get_metric(client, sample):
+    """Значение метрики sample со страницы /metrics."""
+    response = client.get(reverse('metrics'))
+    assert response['Content-Type'].startswith('text/plain')
+    for line in response.content.decode().splitlines():
+        name, _, value = line.rpartition(' ')
+        if name == sample:
+            return float(value)
+    return 0
+
+
+@pytest.mark.django_db
+def test_request_and_cache_metrics(client, news):
+    """Запросы и попадания в кэш главной попадают в метрики."""
+    requests_before = get_metric(client, HOME_REQUESTS)
+    hits_before = get_metric(client, HOME_CACHE_HITS)
+    for _ in range(2):
+        client.get(reverse('news:home'))
+    assert get_metric(client, HOME_REQUESTS) == requests_before + 2
+    assert get_metric(client, HOME_CACHE_HITS) == hits_before + 1
+
+
+@pytest.mark.django_db
+def test_latency_histogram(client, news):
+    """Гистограмма времени обработки содержит все корзины."""
+    client.get(reverse('news:home'))
+    text = client.get(reverse('metrics')).content.decode()
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert (
+        'http_request_duration_seconds_bucket{view="news:home",le="+Inf"}'
+        in text
+    )
+    assert 'db_queries_per_request_count{view="news:home"}' in text
+
+
+@pytest.mark.django_db
+def test_comment_writes_counter(author_client, news):
+    """Создание комментария увеличивает счётчик записей."""
+    before = get_metric(author_client, COMMENTS_CREATED)
+    author_client.post(reverse('news:detail', args=(news.pk,)),
+                       data={'text': 'Текст комментария'})
+    assert get_metric(author_client, COMMENTS_CREATED) == before + 1
+
+
+@pytest.mark.django_db
+def test_metrics_are_summed_across_processes(client, settings, tmp_path):
+    """Значения из файлов других процессов суммируются."""
+    settings.METRICS_DIR = tmp_path
+    before = get_metric(client, HOME_REQUESTS)
+    (tmp_path / 'other.json').write_text(json.dumps({
+        'types': {'http_requests_total': 'counter'},
+        'values': [['http_requests_total',
+                    [['method', 'GET'], ['status', '200'],
+                     ['view', 'news:home']], 5]],
+    }))
+    assert get_metric(client, HOME_REQUESTS) == before + 5
+    assert (tmp_path / f'{metrics._process["id"]}.json').exists()
+
+
+def test_metrics_disabled(client, settings):
+    """Отключённые метрики не отдаются."""
+    settings.METRICS_ENABLED = False
+    assert client.get(reverse('metrics')).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_finished_threads_are_folded():
+    """Значения завершившихся потоков остаются в сумме,
+    а их словари не копятся."""
+    name = 'test_thread_values_total'
+    before = metrics.snapshot().get((name, ()), 0)
+    for _ in range(5):
+        thread = threading.Thread(target=metrics.inc, args=(name,))
+        thread.start()
+        thread.join()
+    assert metrics.snapshot()[(name, ())] == before + 5
+    assert len(metrics._registries) <= threading.active_count()
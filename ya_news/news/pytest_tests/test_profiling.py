@@ -0,0 +1,63 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.PROFILING_ENABLED = True
+    return settings
+
+
+@pytest.mark.django_db
+def test_profiling_disabled_by_default(client, news):
+    """Без PROFILING_ENABLED заголовок Server-Timing не добавляется."""
+    response = client.get(reverse('news:detail', args=(news.pk,)))
+    assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+def test_server_timing_header(profiling, news, comments_count):
+    """В Server-Timing есть время запроса, SQL и шаблона."""
+    response = Client().get(reverse('news:detail', args=(news.pk,)))
+    timing = response['Server-Timing']
+    for metric in ('app;dur=', 'db;dur=', 'slow;dur=', 'tpl;dur='):
+        assert metric in timing
+    assert '"0 queries"' not in timing
+
+
+@pytest.mark.django_db
+def test_slow_queries_in_server_timing(profiling, news, caplog):
+    """
+    Запросы дольше порога считаются в Server-Timing
+    и пишутся в лог как предупреждения.
+    """
+    profiling.PROFILING_SLOW_QUERY_THRESHOLD = 0
+    with caplog.at_level('INFO', logger='common.middleware'):
+        response = Client().get(reverse('news:detail', args=(news.pk,)))
+    assert '"0 slow queries"' not in response['Server-Timing']
+    assert {record.levelname for record in caplog.records} == {'WARNING'}
+
+
+@pytest.mark.django_db
+def test_slowest_queries_are_logged(profiling, news, caplog):
+    """Самые медленные запросы к БД пишутся в лог."""
+    profiling.PROFILING_SLOW_QUERIES = 1
+    with caplog.at_level('INFO', logger='common.middleware'):
+        response = Client().get(reverse('news:detail', args=(news.pk,)))
+    assert len(caplog.records) == 1
+    assert caplog.records[0].levelname == 'INFO'
+    assert 'SELECT' in caplog.records[0].getMessage()
+    assert '"0 slow queries"' in response['Server-Timing']
+
+
+@pytest.mark.django_db
+def test_cprofile_dump(profiling, news, tmp_path):
+    """Профиль сохраняется для запросов дольше порога."""
+    profiling.PROFILING_CPROFILE_DIR = tmp_path
+    profiling.PROFILING_CPROFILE_RATE = 1
+    profiling.PROFILING_CPROFILE_THRESHOLD = 0
+    Client().get(reverse('news:detail', args=(news.pk,)))
+    dumps = list(tmp_path.glob('*.prof'))
+    assert len(dumps) == 1
+    assert 'news-detail' in dumps[0].name
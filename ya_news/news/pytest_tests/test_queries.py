@@ -0,0 +1,65 @@
+import pytest
+from django.urls import reverse
+
+# Сессия и пользователь загружаются в каждом запросе
+# авторизованного пользователя.
+AUTH_QUERIES = 2
+# Сохранение комментария выполняется в транзакции: внутри теста
+# это SAVEPOINT и RELEASE SAVEPOINT.
+SAVEPOINT_QUERIES = 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'method, name, args, data, queries',
+    (
+        # Список новостей.
+        ('get', 'news:home', None, None, AUTH_QUERIES + 1),
+        # Новость, первая порция комментариев.
+        ('get', 'news:detail', pytest.lazy_fixture('pk_for_args'), None,
+         AUTH_QUERIES + 2),
+        # Порция комментариев.
+        ('get', 'news:comments', pytest.lazy_fixture('pk_for_args'), None,
+         AUTH_QUERIES + 1),
+        # Поиск по индексу и загрузка найденных новостей.
+        ('get', 'news:search', None, {'q': 'новости'}, AUTH_QUERIES + 2),
+        # Поиск по индексу и загрузка комментариев с авторами и новостями.
+        ('get', 'news:search', None, {'q': 'комментарий', 'in': 'comments'},
+         AUTH_QUERIES + 2),
+        # Страница новостей API, пользователь не загружается.
+        ('get', 'news:api_news', None, None, 1),
+        # Новость в API.
+        ('get', 'news:api_news_detail', pytest.lazy_fixture('pk_for_args'),
+         None, 1),
+        # Порция комментариев в API.
+        ('get', 'news:api_comments', pytest.lazy_fixture('pk_for_args'),
+         None, 1),
+        # Новость, вставка комментария, счётчик в новости.
+        ('post', 'news:detail', pytest.lazy_fixture('pk_for_args'),
+         {'text': 'Текст комментария'}, AUTH_QUERIES + 3 + SAVEPOINT_QUERIES),
+        # Новость, первая порция комментариев для страницы с ошибкой.
+        ('post', 'news:detail', pytest.lazy_fixture('pk_for_args'),
+         {'text': 'редиска'}, AUTH_QUERIES + 2),
+        # Комментарий вместе с новостью.
+        ('get', 'news:edit', pytest.lazy_fixture('comment_pk_for_args'),
+         None, AUTH_QUERIES + 1),
+        # Комментарий, его обновление, время изменения новости.
+        ('post', 'news:edit', pytest.lazy_fixture('comment_pk_for_args'),
+         {'text': 'Новый текст'}, AUTH_QUERIES + 3 + SAVEPOINT_QUERIES),
+        # Комментарий вместе с новостью.
+        ('get', 'news:delete', pytest.lazy_fixture('comment_pk_for_args'),
+         None, AUTH_QUERIES + 1),
+        # Комментарий, его удаление, счётчик в новости.
+        ('post', 'news:delete', pytest.lazy_fixture('comment_pk_for_args'),
+         None, AUTH_QUERIES + 3),
+    )
+)
+def test_view_query_count(author_client, comment, news_with_comments, method,
+                          name, args, data, queries,
+                          django_assert_num_queries):
+    """Каждое представление выполняет фиксированное число запросов:
+    одна выборка нужных объектов и одна запись. Число запросов
+    не зависит от количества новостей, комментариев и их авторов."""
+    url = reverse(name, args=args)
+    with django_assert_num_queries(queries):
+        getattr(author_client, method)(url, data)
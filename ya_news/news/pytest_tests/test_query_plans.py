@@ -0,0 +1,43 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def get_query_plans(client, url):
+    """Планы выполнения всех SELECT-запросов, выполненных при запросе
+    страницы."""
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+            plans.extend(row[-1] for row in cursor.fetchall())
+    return plans
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Планы запросов SQLite'
+)
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'name, args',
+    (
+        ('news:home', None),
+        ('news:detail', pytest.lazy_fixture('pk_for_args')),
+        ('news:comments', pytest.lazy_fixture('pk_for_args')),
+        ('news:edit', pytest.lazy_fixture('comment_pk_for_args')),
+        ('news:delete', pytest.lazy_fixture('comment_pk_for_args')),
+    )
+)
+def test_queries_use_indexes(author_client, comments_count, name, args):
+    """Запросы к новостям и комментариям используют индексы и не
+    сортируют таблицы целиком."""
+    plans = get_query_plans(author_client, reverse(name, args=args))
+    assert plans
+    for step in plans:
+        assert 'TEMP B-TREE' not in step, step
+        assert not step.startswith('SCAN') or 'USING' in step, step
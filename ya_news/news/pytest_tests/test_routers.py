@@ -0,0 +1,99 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, HttpResponseRedirect
+from django.urls import resolve
+
+from news.models import Comment, News
+from yanews.middleware import ReplicaRoutingMiddleware
+from yanews.routers import (
+    PrimaryReplicaRouter, reset_replica, use_replica,
+)
+
+router = PrimaryReplicaRouter()
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    monkeypatch.setitem(
+        settings.DATABASES, 'replica', settings.DATABASES['default']
+    )
+
+
+def make_middleware(response=HttpResponse):
+    """Middleware, запоминающая базу для чтения новостей в запросе."""
+    databases = []
+
+    def get_response(request):
+        databases.append(router.db_for_read(News))
+        return response()
+
+    return ReplicaRoutingMiddleware(get_response), databases
+
+
+def test_without_replica_reads_primary():
+    """Без реплики всё читается из основной базы."""
+    token = use_replica()
+    assert router.db_for_read(News) == 'default'
+    reset_replica(token)
+
+
+def test_outside_requests_reads_primary(replica):
+    """Вне запросов (команды, миграции) реплика не используется."""
+    assert router.db_for_read(News) == 'default'
+
+
+@pytest.mark.parametrize('model, database', (
+    (News, 'replica'),
+    (Comment, 'replica'),
+    (get_user_model(), 'default'),
+))
+def test_reads_go_to_replica(replica, model, database):
+    """С реплики читаются только новости и комментарии."""
+    token = use_replica()
+    assert router.db_for_read(model) == database
+    reset_replica(token)
+    assert router.db_for_write(model) == 'default'
+
+
+def test_safe_request_reads_replica(replica, rf):
+    """GET-запрос без недавней записи читает с реплики."""
+    middleware, databases = make_middleware()
+    response = middleware(rf.get('/'))
+    assert databases == ['replica']
+    assert settings.REPLICA_STICKY_COOKIE not in response.cookies
+
+
+def test_write_pins_primary_and_sets_cookie(replica, rf):
+    """После успешной записи выставляется cookie закрепления."""
+    middleware, databases = make_middleware(
+        lambda: HttpResponseRedirect('/')
+    )
+    response = middleware(rf.post('/'))
+    assert databases == ['default']
+    cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+    assert cookie['max-age'] == settings.REPLICA_STICKY_SECONDS
+
+
+def test_sticky_cookie_reads_primary(replica, rf):
+    """Сразу после записи пользователь читает из основной базы."""
+    middleware, databases = make_middleware()
+    request = rf.get('/')
+    request.COOKIES[settings.REPLICA_STICKY_COOKIE] = '1'
+    middleware(request)
+    assert databases == ['default']
+
+
+@pytest.mark.parametrize('path', ('/edit_comment/1/', '/admin/'))
+def test_views_pinned_to_primary(replica, rf, path):
+    """Редактирование комментариев и админка работают с основной базой."""
+    request = rf.get(path)
+    request.resolver_match = match = resolve(path)
+
+    def get_response(request):
+        middleware.process_view(request, match.func, match.args,
+                                match.kwargs)
+        return HttpResponse(router.db_for_read(News))
+
+    middleware = ReplicaRoutingMiddleware(get_response)
+    assert middleware(request).content == b'default'
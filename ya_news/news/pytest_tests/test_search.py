@@ -0,0 +1,128 @@
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from news.models import Comment, News
+from news.search import get_terms, search
+
+
+@pytest.fixture
+def search_news(author):
+    news = News.objects.create(
+        title='Ёлка на площади',
+        text='На главной площади города поставили новогоднюю ёлку.',
+    )
+    other = News.objects.create(
+        title='Погода',
+        text='Синоптики обещают снег. Ёлку на площади украсят к выходным.',
+    )
+    Comment.objects.create(news=news, author=author,
+                           text='Красивая ёлка, <b>спасибо</b>!')
+    return news, other
+
+
+@pytest.mark.parametrize('query, terms', (
+    ('Новостей', ['новост']),
+    ('ЁЛКИ и площадь', ['елк', 'и', 'площад']),
+    ('  ', []),
+))
+def test_query_terms(query, terms):
+    """Слова запроса приводятся к основе и нижнему регистру."""
+    assert get_terms(query) == terms
+
+
+@pytest.mark.django_db
+def test_word_forms_are_found(search_news):
+    """Поиск находит другие формы слов, «е» и «ё» не различаются."""
+    results, has_next = search(News, 'елки площадью')
+    assert [news.pk for news in results] == [news.pk for news in search_news]
+    assert has_next is False
+
+
+@pytest.mark.django_db
+def test_title_match_ranks_higher(search_news):
+    """Совпадение в заголовке ставит новость выше."""
+    news, other = search_news
+    results, _ = search(News, 'погода площадь')
+    assert results == [other]
+    results, _ = search(News, 'елка')
+    assert results[0] == news
+
+
+@pytest.mark.django_db
+def test_comment_snippet_is_escaped(search_news):
+    """Фрагмент комментария экранирован, найденное слово выделено."""
+    results, _ = search(Comment, 'спасибо')
+    assert len(results) == 1
+    assert '<mark>спасибо</mark>' in results[0].snippet
+    assert '&lt;b&gt;' in results[0].snippet
+
+
+@pytest.mark.django_db
+def test_index_follows_changes(search_news, author):
+    """Индекс обновляется при изменении и удалении записей."""
+    news, other = search_news
+    comment = Comment.objects.create(news=other, author=author,
+                                     text='Снеговик')
+    assert search(Comment, 'снеговик')[0] == [comment]
+    comment.text = 'Снегурочка'
+    comment.save()
+    assert search(Comment, 'снеговик')[0] == []
+    assert search(Comment, 'снегурочка')[0] == [comment]
+    # Счётчик комментариев меняется, текст новости остаётся в индексе.
+    assert search(News, 'синоптики')[0] == [other]
+    other.delete()
+    assert search(News, 'синоптики')[0] == []
+    assert search(Comment, 'снегурочка')[0] == []
+
+
+@pytest.mark.django_db
+def test_search_pagination(client, news, settings):
+    """Результаты выводятся по страницам."""
+    settings.SEARCH_RESULTS_ON_PAGE = 2
+    News.objects.bulk_create(
+        News(title=f'Выборы {index}', text='Текст') for index in range(3)
+    )
+    url = reverse('news:search')
+    response = client.get(url, {'q': 'выборы'})
+    assert len(response.context['results']) == 2
+    assert response.context['has_next'] is True
+    response = client.get(url, {'q': 'выборы', 'page': 2})
+    assert len(response.context['results']) == 1
+    assert response.context['has_next'] is False
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', (
+    {'q': 'ёлка', 'page': 'x'},
+    {'q': 'ёлка', 'page': 0},
+    {'q': 'ёлка', 'page': settings.SEARCH_MAX_PAGE + 1},
+    {'q': 'ёлка', 'in': 'users'},
+))
+def test_invalid_search_params(client, params):
+    """Некорректные параметры поиска дают 404."""
+    response = client.get(reverse('news:search'), params)
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_search_page(client, search_news, django_assert_num_queries):
+    """Страница поиска: поиск по индексу и загрузка найденного."""
+    with django_assert_num_queries(2):
+        response = client.get(
+            reverse('news:search'), {'q': 'ёлка', 'in': 'comments'}
+        )
+    assert 'Красивая' in response.content.decode()
+    assert '<mark>' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_rank_window(news, settings):
+    """Для частых слов ранжируются только последние совпадения."""
+    settings.SEARCH_RANK_WINDOW = 2
+    News.objects.bulk_create(
+        News(title=f'Выборы {index}', text='Текст') for index in range(3)
+    )
+    results, has_next = search(News, 'выборы')
+    assert [news.title for news in results] == ['Выборы 2', 'Выборы 1']
+    assert has_next is False
@@ -0,0 +1,181 @@
+"""
+Полнотекстовый поиск по новостям и комментариям.
+
+В SQLite используются таблицы FTS5 из миграции 0006_search,
+в PostgreSQL - GIN-индексы по to_tsvector('russian', ...).
+Русские слова приводятся к основе отбрасыванием окончаний
+и ищутся по префиксу, поэтому «новостей» находит «новость».
+"""
+import re
+
+from django.conf import settings
+from django.db import connections, router
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Comment, News
+
+WORD_RE = re.compile(r'\w+')
+MAX_TERMS = 10
+MIN_STEM_LENGTH = 3
+# Окончания, от длинных к коротким.
+ENDINGS = sorted((
+    'ами', 'ями', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими', 'ой', 'ей',
+    'ий', 'ый', 'ая', 'яя', 'ое', 'ее', 'ие', 'ые', 'ую', 'юю', 'ам', 'ям',
+    'ах', 'ях', 'ов', 'ев', 'ом', 'ем', 'ью', 'ия', 'ть', 'ся',
+    'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+), key=len, reverse=True)
+# Границы подсвеченных фрагментов до экранирования HTML.
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+
+def normalize(text):
+    return text.lower().replace('ё', 'е')
+
+
+def stem(word):
+    """Основа слова без окончания, не короче MIN_STEM_LENGTH букв."""
+    for ending in ENDINGS:
+        if (word.endswith(ending)
+                and len(word) - len(ending) >= MIN_STEM_LENGTH):
+            return word[:-len(ending)]
+    return word
+
+
+def get_terms(query):
+    """Основы слов запроса."""
+    return [stem(word) for word in WORD_RE.findall(normalize(query))][
+        :MAX_TERMS
+    ]
+
+
+def highlight(fragment):
+    """Экранирует фрагмент и выделяет в нём найденные слова."""
+    return mark_safe(
+        escape(fragment)
+        .replace(MARK_START, '<mark>')
+        .replace(MARK_END, '</mark>')
+    )
+
+
+class SQLiteBackend:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @staticmethod
+    def match(terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, fts, weights, snippet_column, terms, limit, offset):
+        """Пары (id, фрагмент), самые релевантные первыми."""
+        sql = (
+            f'SELECT rowid, snippet({fts}, %s, %s, %s, %s, %s) '
+            f'FROM {fts} WHERE {fts} MATCH %s AND rowid >= coalesce(('
+            f'  SELECT rowid FROM {fts} WHERE {fts} MATCH %s '
+            f'  ORDER BY rowid DESC LIMIT 1 OFFSET %s'
+            f'), 0) '
+            f'ORDER BY bm25({fts}, {weights}), rowid DESC LIMIT %s OFFSET %s'
+        )
+        match = self.match(terms)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, (
+                snippet_column, MARK_START, MARK_END, '…',
+                settings.SEARCH_SNIPPET_WORDS, match,
+                match, settings.SEARCH_RANK_WINDOW - 1,
+                limit, offset,
+            ))
+            return cursor.fetchall()
+
+    def search_news(self, terms, limit, offset):
+        # Совпадение в заголовке весит больше, чем в тексте.
+        return self.search('news_news_fts', '10.0, 1.0', 1, terms,
+                           limit, offset)
+
+    def search_comments(self, terms, limit, offset):
+        return self.search('news_comment_fts', '1.0', 0, terms,
+                           limit, offset)
+
+
+class PostgreSQLBackend:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @staticmethod
+    def match(terms):
+        return ' & '.join(f"'{term}':*" for term in terms)
+
+    def search(self, table, document, snippet, terms, limit, offset):
+        # Выражения совпадают с индексами из миграции 0006_search.
+        sql = (
+            f"WITH found AS ("
+            f"  SELECT * FROM {table}, to_tsquery('russian', %s) AS query "
+            f"  WHERE to_tsvector('russian', {document}) @@ query "
+            f"  ORDER BY id DESC LIMIT %s"
+            f") "
+            f"SELECT id, ts_headline('russian', {snippet}, query, %s) "
+            f"FROM found "
+            f"ORDER BY ts_rank(to_tsvector('russian', {document}), query) "
+            f"DESC, id DESC LIMIT %s OFFSET %s"
+        )
+        options = (
+            f'StartSel={MARK_START}, StopSel={MARK_END}, '
+            f'MaxWords={settings.SEARCH_SNIPPET_WORDS}, '
+            f'MinWords={settings.SEARCH_SNIPPET_WORDS // 2}'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, (
+                self.match(terms), settings.SEARCH_RANK_WINDOW, options,
+                limit, offset,
+            ))
+            return cursor.fetchall()
+
+    def search_news(self, terms, limit, offset):
+        return self.search('news_news', "title || ' ' || text", 'text',
+                           terms, limit, offset)
+
+    def search_comments(self, terms, limit, offset):
+        return self.search('news_comment', 'text', 'text',
+                           terms, limit, offset)
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'postgresql': PostgreSQLBackend,
+}
+
+
+def search(model, query, page=1):
+    """
+    Страница результатов поиска по новостям или комментариям.
+
+    Возвращает список объектов с атрибутом snippet (подсвеченный
+    фрагмент текста) и признак наличия следующей страницы.
+    Общее число найденного не считается: на миллионах комментариев
+    это дороже самого поиска. По той же причине для очень частых слов
+    ранжируются только SEARCH_RANK_WINDOW последних совпадений.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return [], False
+    connection = connections[router.db_for_read(model)]
+    backend = BACKENDS[connection.vendor](connection)
+    limit = settings.SEARCH_RESULTS_ON_PAGE
+    if model is News:
+        rows = backend.search_news(terms, limit + 1, (page - 1) * limit)
+        queryset = News.objects.defer('text')
+    else:
+        rows = backend.search_comments(terms, limit + 1, (page - 1) * limit)
+        queryset = Comment.objects.select_related('author', 'news').only(
+            'text', 'created', 'author__username', 'news__title'
+        )
+    objects = queryset.in_bulk([pk for pk, snippet in rows[:limit]])
+    results = []
+    for pk, snippet in rows[:limit]:
+        # Объект мог быть удалён между двумя запросами.
+        if pk in objects:
+            objects[pk].snippet = highlight(snippet)
+            results.append(objects[pk])
+    return results, len(rows) > limit
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from common import metrics
+
+from .cache import bump_home_version
+from .models import Comment, News
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, using, **kwargs):
+    """
+    Обновляет счётчик комментариев и время изменения новости,
+    а для нового комментария сбрасывает кэш главной.
+    """
+    changes = {'modified': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+        transaction.on_commit(bump_home_version, using=using)
+    News.objects.filter(pk=instance.news_id).update(**changes)
+    metrics.inc('comment_writes_total',
+                action='created' if created else 'updated')
+
+
+@receiver(post_delete, sender=Comment)
+def comment_removed(sender, instance, using, **kwargs):
+    """
+    Уменьшает счётчик комментариев, обновляет время изменения
+    новости и сбрасывает кэш главной.
+    """
+    News.objects.filter(pk=instance.news_id).update(
+        comment_count=Greatest(F('comment_count') - 1, 0),
+        modified=timezone.now(),
+    )
+    transaction.on_commit(bump_home_version, using=using)
+    metrics.inc('comment_writes_total', action='deleted')
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def news_changed(sender, using, **kwargs):
+    """Список новостей на главной изменился."""
+    transaction.on_commit(bump_home_version, using=using)
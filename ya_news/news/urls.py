@@ -1,16 +1,41 @@
+from django.conf import settings
 from django.urls import path
 
-from news import views
+from news import api, views
 
 app_name = 'news'
 
+if settings.NEWS_ASYNC_VIEWS:
+    from news.async_views import (
+        api_comments, api_news, api_news_detail, news_detail, news_list,
+    )
+else:
+    news_list = views.NewsList.as_view()
+    news_detail = views.NewsDetailView.as_view()
+    api_news = api.NewsListApi.as_view()
+    api_news_detail = api.NewsDetailApi.as_view()
+    api_comments = api.CommentListApi.as_view()
+
 urlpatterns = [
-    path('', views.NewsList.as_view(), name='home'),
-    path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path('', news_list, name='home'),
+    path('news/<int:pk>/', news_detail, name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.CommentList.as_view(),
+        name='comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
         name='delete'
     ),
     path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('api/news/', api_news, name='api_news'),
+    path('api/news/<int:pk>/', api_news_detail, name='api_news_detail'),
+    path(
+        'api/news/<int:pk>/comments/',
+        api_comments,
+        name='api_comments'
+    ),
 ]
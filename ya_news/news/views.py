@@ -1,11 +1,19 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
+from .cache import add_comment_bodies, get_home_html
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import get_comments_page
+from .search import search
 
 
 class NewsList(generic.ListView):
@@ -18,30 +26,123 @@ class NewsList(generic.ListView):
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Количество комментариев и анонс хранятся в самой новости,
+        полный текст не загружается.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
+        return self.model.objects.defer(
+            'text'
         )[:settings.NEWS_COUNT_ON_HOME_PAGE]
 
+    def get_context_data(self, **kwargs):
+        """
+        Список новостей берётся из кэша.
+
+        Запрос к БД выполняется, только если версия списка изменилась.
+        """
+        context = super().get_context_data(**kwargs)
+        context['news_list_html'] = get_home_html(
+            lambda: render_to_string(
+                'news/news_list.html', {'object_list': self.object_list}
+            )
+        )
+        return context
+
 
+def get_news(request, pk):
+    """
+    Новость для страницы новости или None, если её нет.
+
+    Загружается один раз за запрос: её используют и ETag с Last-Modified,
+    и сама страница.
+    """
+    if not hasattr(request, 'news'):
+        request.news = News.objects.filter(pk=pk).first()
+    return request.news
+
+
+def news_etag(request, pk):
+    """
+    ETag страницы новости.
+
+    Страница зависит от пользователя (ссылки на свои комментарии, форма
+    с CSRF-токеном), поэтому в ETag входят id пользователя и отпечаток
+    CSRF-cookie.
+    """
+    news = get_news(request, pk)
+    if news is None:
+        return None
+    user_key = 'anonymous'
+    if request.user.is_authenticated:
+        csrf_hash = hashlib.md5(
+            request.META.get('CSRF_COOKIE', '').encode()
+        ).hexdigest()[:8]
+        user_key = f'{request.user.pk}-{csrf_hash}'
+    return (
+        f'W/"{pk}-{news.modified.timestamp()}-{news.comment_count}-'
+        f'{user_key}"'
+    )
+
+
+def news_last_modified(request, pk):
+    """
+    Last-Modified страницы новости.
+
+    Отдаётся только анонимным пользователям: для остальных страница
+    зависит ещё и от пользователя, что учитывает только ETag.
+    """
+    news = get_news(request, pk)
+    if news is None or request.user.is_authenticated:
+        return None
+    return news.modified
+
+
+@method_decorator(
+    condition(etag_func=news_etag, last_modified_func=news_last_modified),
+    name='dispatch'
+)
 class NewsDetail(generic.DetailView):
     model = News
     template_name = 'news/detail.html'
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
+        obj = get_news(self.request, self.kwargs['pk'])
+        if obj is None:
+            raise Http404('Новость не найдена.')
         return obj
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['comments'], context['next_cursor'] = get_comments_page(
+            self.object.pk
+        )
+        add_comment_bodies(context['comments'])
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
         return context
 
 
+class CommentList(generic.ListView):
+    """Следующая порция комментариев к новости."""
+    template_name = 'news/comments.html'
+    context_object_name = 'comments'
+
+    def get_queryset(self):
+        try:
+            comments, self.next_cursor = get_comments_page(
+                self.kwargs['pk'], self.request.GET.get('after')
+            )
+        except ValueError:
+            raise Http404('Некорректный курсор.')
+        add_comment_bodies(comments)
+        return comments
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        context['news_pk'] = self.kwargs['pk']
+        return context
+
+
 class NewsComment(
         LoginRequiredMixin,
         generic.detail.SingleObjectMixin,
@@ -62,35 +163,51 @@ class NewsComment(
         comment.save()
         return super().form_valid(form)
 
+    def form_invalid(self, form):
+        """Страница новости с ошибкой формы и первыми комментариями."""
+        comments, next_cursor = get_comments_page(self.object.pk)
+        add_comment_bodies(comments)
+        return self.render_to_response(self.get_context_data(
+            form=form, comments=comments, next_cursor=next_cursor
+        ))
+
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
+    detail_view = staticmethod(NewsDetail.as_view())
+    comment_view = staticmethod(NewsComment.as_view())
 
     def get(self, request, *args, **kwargs):
-        view = NewsDetail.as_view()
-        return view(request, *args, **kwargs)
+        return self.detail_view(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
-        view = NewsComment.as_view()
-        return view(request, *args, **kwargs)
+        return self.comment_view(request, *args, **kwargs)
 
 
 class CommentBase(LoginRequiredMixin):
     """Базовый класс для работы с комментариями."""
     model = Comment
+    use_primary_db = True
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
-        """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        """
+        Пользователь может работать только со своими комментариями.
+
+        Новость нужна шаблонам редактирования и удаления,
+        поэтому загружается тем же запросом.
+        """
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related('news')
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
@@ -102,3 +219,31 @@ class CommentUpdate(CommentBase, generic.UpdateView):
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+
+class NewsSearch(generic.TemplateView):
+    """Поиск по новостям или комментариям с постраничным выводом."""
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        target = self.request.GET.get('in', 'news')
+        if target not in ('news', 'comments'):
+            raise Http404
+        try:
+            page = int(self.request.GET.get('page', 1))
+        except ValueError:
+            raise Http404
+        # Глубокие страницы требуют пропуска всех предыдущих
+        # результатов, поэтому их число ограничено.
+        if not 1 <= page <= settings.SEARCH_MAX_PAGE:
+            raise Http404
+        results, has_next = search(
+            News if target == 'news' else Comment, query, page
+        )
+        context.update(
+            query=query, target=target, results=results,
+            page=page, has_next=has_next and page < settings.SEARCH_MAX_PAGE,
+        )
+        return context
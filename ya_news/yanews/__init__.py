@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Общие для YaNews и YaNote модули (пакет common) лежат в корне
+# репозитория.
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
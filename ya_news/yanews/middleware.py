@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from common.middleware import SyncAndAsyncMiddleware
+from yanews import routers
+
+
+class ReplicaRoutingMiddleware(SyncAndAsyncMiddleware):
+    """
+    Выбор базы для чтения новостей.
+
+    Запросы, изменяющие данные, админка и представления с атрибутом
+    use_primary_db работают только с основной базой. После успешной
+    записи пользователь REPLICA_STICKY_SECONDS секунд читает
+    из основной базы, чтобы сразу видеть свои изменения, пока они
+    не дошли до реплики.
+    """
+
+    def __init__(self, get_response):
+        if routers.REPLICA not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    @staticmethod
+    def writes(request):
+        return request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def start(self, request):
+        return routers.use_replica(
+            not self.writes(request)
+            and settings.REPLICA_STICKY_COOKIE not in request.COOKIES
+        )
+
+    def finish(self, request, response, token):
+        routers.reset_replica(token)
+        if (response is not None and self.writes(request)
+                and response.status_code < 400):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', view_func)
+        if (request.resolver_match.app_name == 'admin'
+                or getattr(view_class, 'use_primary_db', False)):
+            routers.use_replica(False)
@@ -0,0 +1,47 @@
+"""
+Чтение новостей и комментариев с реплики.
+
+Реплика используется, только если в DATABASES есть соединение
+REPLICA, и только там, где это разрешила ReplicaRoutingMiddleware:
+в запросах на чтение вне админки и представлений с атрибутом
+use_primary_db. Команды, миграции и shell работают с основной базой.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+# Приложения, модели которых читаются с реплики. Сессии
+# и пользователи всегда читаются из основной базы.
+REPLICA_APP_LABELS = {'news'}
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def use_replica(value=True):
+    """
+    Разрешает или запрещает чтение с реплики в текущем контексте.
+    Возвращает токен для reset_replica().
+    """
+    return _use_replica.set(value)
+
+
+def reset_replica(token):
+    _use_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (REPLICA in settings.DATABASES and _use_replica.get()
+                and model._meta.app_label in REPLICA_APP_LABELS):
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика содержит те же данные, что и основная база.
+        return True
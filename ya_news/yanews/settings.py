@@ -1,7 +1,10 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
 
+from common.database import get_database, get_replicas
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-7)dgs++2!#==aye4rd=5)c)bw0eokiyqx0hts6#t80!$c&$s+('
@@ -21,6 +24,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'common.middleware.ProfilingMiddleware',
+    'common.middleware.MetricsMiddleware',
+    'yanews.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,11 +58,11 @@ WSGI_APPLICATION = 'yanews.wsgi.application'
 
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': get_database(BASE_DIR, 'yanews'),
 }
+DATABASES.update(get_replicas(DATABASES['default']))
+
+DATABASE_ROUTERS = ['yanews.routers.PrimaryReplicaRouter']
 
 
 AUTH_PASSWORD_VALIDATORS = []
@@ -80,3 +86,71 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_COUNT_ON_DETAIL_PAGE = 50
+
+# Размер страницы JSON API по умолчанию и наибольший (параметр limit).
+API_DEFAULT_LIMIT = 20
+API_MAX_LIMIT = 100
+
+SEARCH_RESULTS_ON_PAGE = 20
+SEARCH_MAX_PAGE = 50
+# Сколько последних совпадений ранжируется, если их больше.
+SEARCH_RANK_WINDOW = 5000
+# Длина подсвеченного фрагмента текста в результатах поиска, в словах.
+SEARCH_SNIPPET_WORDS = 12
+
+# Файл с дополнительными запрещёнными словами, по одному на строку.
+BAD_WORDS_FILE = None
+
+# Для нескольких процессов нужен общий кэш (Memcached, Redis):
+# иначе сброс версии списка новостей не дойдёт до других процессов.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+NEWS_CACHE_ALIAS = 'default'
+NEWS_HOME_CACHE_TIMEOUT = 60 * 60
+# HTML отдельных комментариев. Имя автора берётся из кэша,
+# поэтому после его изменения старое имя видно до истечения срока.
+NEWS_COMMENT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Профилирование запросов: заголовок Server-Timing и медленные
+# SQL-запросы в логе (логгер common.middleware). Профили cProfile
+# сохраняются, только если задан PROFILING_CPROFILE_DIR.
+PROFILING_ENABLED = False
+PROFILING_SLOW_QUERIES = 5
+PROFILING_SLOW_QUERY_THRESHOLD = 0.1
+PROFILING_CPROFILE_DIR = None
+PROFILING_CPROFILE_RATE = 0.1
+PROFILING_CPROFILE_THRESHOLD = 0.5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'common.middleware': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Метрики для /metrics, METRICS_ENABLED=0 отключает их. Когда
+# процессов несколько, METRICS_DIR должен указывать на общий для них
+# каталог; его стоит очищать при развёртывании.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 10
+
+# После записи пользователь столько секунд читает из основной базы,
+# а не с реплики: это время должно покрывать задержку репликации.
+REPLICA_STICKY_COOKIE = 'use_primary'
+REPLICA_STICKY_SECONDS = 10
+
+# Асинхронные страницы списка и новости для запуска под ASGI
+# (см. news/async_views.py). Под WSGI их включать не нужно.
+NEWS_ASYNC_VIEWS = os.getenv('NEWS_ASYNC_VIEWS') == '1'
+NEWS_ASYNC_THREADS = int(os.getenv('NEWS_ASYNC_THREADS', 16))
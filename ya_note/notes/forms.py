@@ -1,29 +1,65 @@
-from pytils.translit import slugify
-
 from django import forms
 from django.core.exceptions import ValidationError
 
 from .models import Note
+from .slugs import allocate_slug
 
 WARNING = ' - такой slug уже существует, придумайте уникальное значение!'
 
 
 class NoteForm(forms.ModelForm):
     """Форма для создания или обновления заметки."""
+    # Был ли slug сформирован из заголовка, а не указан пользователем.
+    slug_generated = False
 
     class Meta:
         model = Note
         fields = ('title', 'text', 'slug')
 
     def clean_slug(self):
-        """Обрабатывает случай, если slug не уникален."""
-        cleaned_data = super().clean()
-        slug = cleaned_data.get('slug')
+        """Подбирает свободный slug по заголовку, если он не указан."""
+        slug = self.cleaned_data.get('slug')
         if not slug:
-            title = cleaned_data.get('title')
-            slug = slugify(title)[:100]
-        if Note.objects.filter(
-                slug=slug
-        ).exclude(id=self.instance.pk).exists():
-            raise ValidationError(slug + WARNING)
+            slug = allocate_slug(
+                self.cleaned_data.get('title'), exclude_pk=self.instance.pk
+            )
+            self.slug_generated = True
         return slug
+
+    def validate_unique(self):
+        """
+        Уникальность slug не проверяется отдельным запросом.
+
+        Конфликт обнаруживает БД при сохранении заметки.
+        """
+        exclude = self._get_validation_exclusions()
+        exclude.append('slug')
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as error:
+            self._update_errors(error)
+
+
+class NoteImportForm(NoteForm):
+    """
+    Проверка строки импорта по правилам NoteForm.
+
+    Свободные slug для строк без slug подбираются сразу для пачки
+    заметок в notes.transfer, поэтому здесь они не вычисляются.
+    """
+
+    def clean_slug(self):
+        slug = self.cleaned_data.get('slug')
+        self.slug_generated = not slug
+        return slug
+
+
+class ImportForm(forms.Form):
+    """Файл с заметками для импорта."""
+    file = forms.FileField(label='Файл')
+    format = forms.ChoiceField(
+        label='Формат',
+        choices=(('ndjson', 'NDJSON'), ('csv', 'CSV')),
+        help_text=('Каждая заметка - объект JSON в отдельной строке '
+                   'или строка CSV с заголовком title,text,slug'),
+    )
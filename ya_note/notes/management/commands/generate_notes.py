@@ -0,0 +1,94 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from common.generate import create_users, zipf_weights
+
+from notes.models import Note
+from notes.slugs import title_to_slug
+
+BATCH_SIZE = 5000
+COMMON_TITLES = (
+    'Встреча',
+    'Список покупок',
+    'Идеи',
+    'Позвонить',
+    'Дела на завтра',
+)
+
+
+class Command(BaseCommand):
+    help = 'Создаёт пользователей и заметки для бенчмарков и оценки нагрузки.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--notes', type=int, default=100000)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.0,
+            help=(
+                'Показатель закона Ципфа для числа заметок у авторов: '
+                '0 - равномерно, больше - больше заметок у первых авторов.'
+            ),
+        )
+        parser.add_argument(
+            '--title-collisions',
+            type=float,
+            default=0.2,
+            help=(
+                'Доля заметок с одним из нескольких популярных заголовков '
+                'для проверки подбора slug.'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+        user_ids = create_users(options['users'], options['batch_size'])
+        count = 0
+        if user_ids:
+            count = options['notes']
+            self.create_notes(
+                count, user_ids, options['skew'],
+                options['title_collisions'], options['batch_size'], rng,
+            )
+        self.stdout.write(
+            f'Создано пользователей: {len(user_ids)}, заметок: {count} '
+            f'за {time.perf_counter() - started:.1f} с.'
+        )
+
+    def create_notes(self, count, user_ids, skew, collisions, batch_size,
+                     rng):
+        # Номер в slug больше любого id, поэтому не совпадает
+        # с уже существующими slug вида «заголовок-N».
+        offset = (Note.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+        # Самые активные авторы выбираются случайно.
+        user_ids = rng.sample(user_ids, len(user_ids))
+        weights = zipf_weights(len(user_ids), skew)
+
+        def make_note(number, author_id):
+            if rng.random() < collisions:
+                title = rng.choice(COMMON_TITLES)
+            else:
+                title = f'Заметка {number}'
+            return Note(
+                title=title,
+                text=f'Текст заметки {number}',
+                slug=f'{title_to_slug(title)}-{number}',
+                author_id=author_id,
+            )
+
+        with transaction.atomic():
+            for start in range(0, count, batch_size):
+                size = min(batch_size, count - start)
+                authors = rng.choices(user_ids, cum_weights=weights, k=size)
+                Note.objects.bulk_create(
+                    make_note(offset + start + index, author_id)
+                    for index, author_id in enumerate(authors)
+                )
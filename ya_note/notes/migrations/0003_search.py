@@ -0,0 +1,75 @@
+# Generated by Django 3.2.15 on 2026-10-18 03:30
+
+import re
+
+from django.db import migrations
+
+# Копия notes.search на момент миграции: её результат не должен
+# меняться вместе с кодом приложения.
+FTS_TABLE = 'notes_note_fts'
+WORD_RE = re.compile(r'[^\W_]+')
+SQLITE_TOKENIZER = 'unicode61 remove_diacritics 2'
+# PostgreSQL: выражение повторяет notes.search.PostgreSQLBackend.
+POSTGRESQL_INDEX = 'notes_note_search_idx'
+POSTGRESQL_EXPRESSION = (
+    "to_tsvector('simple', translate(title || ' ' || text, 'ёЁ', 'еЕ'))"
+)
+BATCH_SIZE = 5000
+
+
+def index_terms(author_id, title, text):
+    """Слова заголовка и текста заметки с префиксом автора."""
+    words = WORD_RE.findall(f'{title} {text}'.lower().replace('ё', 'е'))
+    return ' '.join(f'a{author_id}x{word}' for word in words)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        # Слова с префиксом автора собираются в Python, поэтому
+        # индекс заполняет и обновляет приложение, а не триггеры.
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(terms, "
+            f"tokenize='{SQLITE_TOKENIZER}')"
+        )
+        Note = apps.get_model('notes', 'Note')
+        notes = Note.objects.using(
+            schema_editor.connection.alias
+        ).values_list('id', 'author_id', 'title', 'text').iterator()
+        rows = []
+        with schema_editor.connection.cursor() as cursor:
+            for pk, author_id, title, text in notes:
+                rows.append((pk, index_terms(author_id, title, text)))
+                if len(rows) == BATCH_SIZE:
+                    cursor.executemany(
+                        f'INSERT INTO {FTS_TABLE}(rowid, terms) '
+                        f'VALUES (%s, %s)', rows
+                    )
+                    rows = []
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE}(rowid, terms) VALUES (%s, %s)', rows
+            )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {POSTGRESQL_INDEX} ON notes_note '
+            f'USING GIN ({POSTGRESQL_EXPRESSION})'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX {POSTGRESQL_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_author_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,7 +1,46 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
-from pytils.translit import slugify
+from common import metrics
+
+from . import search
+from .slugs import allocate_slug
+
+# Сколько slug искать одним запросом после bulk_create.
+SLUG_BATCH_SIZE = 500
+
+
+class NoteQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        bulk_create не отправляет сигналы, поэтому созданные заметки
+        добавляются в поисковый индекс и метрики здесь. SQLite
+        не возвращает id созданных строк, их находят по уникальному slug.
+        """
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            if kwargs.get('ignore_conflicts'):
+                # Неизвестно, какие строки действительно были вставлены,
+                # поэтому индексируются заметки из БД.
+                for notes in self._by_slugs([obj.slug for obj in objs]):
+                    search.index_notes(
+                        notes.only('id', 'author_id', 'title', 'text'),
+                        self.db,
+                    )
+            else:
+                missing = {obj.slug: obj for obj in objs if obj.pk is None}
+                for notes in self._by_slugs(list(missing)):
+                    for pk, slug in notes.values_list('pk', 'slug'):
+                        missing[slug].pk = pk
+                search.index_notes(objs, self.db)
+        metrics.inc('note_writes_total', len(objs), action='created')
+        return objs
+
+    def _by_slugs(self, slugs):
+        """Запросы заметок с указанными slug, по SLUG_BATCH_SIZE в каждом."""
+        for start in range(0, len(slugs), SLUG_BATCH_SIZE):
+            yield self.filter(slug__in=slugs[start:start + SLUG_BATCH_SIZE])
 
 
 class Note(models.Model):
@@ -23,16 +62,24 @@ class Note(models.Model):
         help_text=('Укажите адрес для страницы заметки. Используйте только '
                    'латиницу, цифры, дефисы и знаки подчёркивания')
     )
+    # Индекс по автору заменяет составной индекс из Meta.indexes.
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
 
+    objects = NoteQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
+            self.slug = allocate_slug(self.title, exclude_pk=self.pk)
         super().save(*args, **kwargs)
@@ -0,0 +1,28 @@
+from django.conf import settings
+
+# Наибольший id, который помещается в 64-битный INTEGER базы.
+MAX_ID = 2 ** 63 - 1
+
+
+def get_notes_page(notes, cursor=None, limit=None):
+    """
+    Порция заметок по порядку id после курсора и курсор следующей порции.
+
+    Курсор - id последней заметки предыдущей порции. Выборка по ключу
+    обслуживается индексом (author, id), поэтому её стоимость не зависит
+    от числа заметок автора и от того, насколько далеко пролистан
+    список. При ошибке формата курсора или id за пределами 64-битного
+    диапазона выбрасывает ValueError.
+    """
+    if limit is None:
+        limit = settings.NOTES_COUNT_ON_LIST_PAGE
+    notes = notes.order_by('id')
+    if cursor:
+        pk = int(cursor)
+        if pk > MAX_ID:
+            raise ValueError(f'id вне допустимого диапазона: {pk}')
+        notes = notes.filter(pk__gt=pk)
+    notes = list(notes[:limit + 1])
+    if len(notes) > limit:
+        return notes[:limit], notes[limit - 1].pk
+    return notes, None
@@ -0,0 +1,143 @@
+"""
+Поиск по заметкам автора.
+
+В SQLite заметки индексирует таблица FTS5 из миграции 0003_search.
+Каждое слово попадает в индекс с префиксом автора «a<id>x», поэтому
+поиск по началу слова перебирает только слова одного автора и не
+замедляется от чужих заметок. Индекс обновляют сигналы из
+notes.signals и NoteQuerySet.bulk_create; QuerySet.update() его
+не обновляет.
+
+В PostgreSQL используется GIN-индекс по to_tsvector('simple', ...)
+вместе с индексом по автору.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections
+
+# Те же слова, что выделяет токенизатор unicode61. Миграция 0003_search
+# заполнила индекс по своей копии этих правил, поэтому при их изменении
+# нужна новая миграция, которая перестроит индекс.
+WORD_RE = re.compile(r'[^\W_]+')
+MAX_TERMS = 10
+FTS_TABLE = 'notes_note_fts'
+
+
+def normalize(text):
+    return text.lower().replace('ё', 'е')
+
+
+def get_words(text):
+    return WORD_RE.findall(normalize(text))
+
+
+def author_prefix(author_id):
+    return f'a{author_id}x'
+
+
+def index_terms(author_id, title, text):
+    """Слова заголовка и текста заметки с префиксом автора."""
+    prefix = author_prefix(author_id)
+    return ' '.join(prefix + word for word in get_words(f'{title} {text}'))
+
+
+class SQLiteBackend:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index(self, notes):
+        rows = [
+            (note.pk, index_terms(note.author_id, note.title, note.text))
+            for note in notes
+        ]
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {FTS_TABLE}(rowid, terms) '
+                f'VALUES (%s, %s)', rows,
+            )
+
+    def remove(self, pks):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(pk,) for pk in pks],
+            )
+
+    def search(self, author_id, words, limit, offset):
+        prefix = author_prefix(author_id)
+        match = ' '.join(f'"{prefix}{word}"*' for word in words)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY rowid DESC LIMIT %s OFFSET %s',
+                (match, limit, offset),
+            )
+            return [pk for pk, in cursor.fetchall()]
+
+
+class PostgreSQLBackend:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index(self, notes):
+        """Индекс по выражению обновляет сама база."""
+
+    def remove(self, pks):
+        """Индекс по выражению обновляет сама база."""
+
+    def search(self, author_id, words, limit, offset):
+        # Выражение совпадает с индексом из миграции 0003_search.
+        match = ' & '.join(f'{word}:*' for word in words)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id FROM notes_note WHERE author_id = %s "
+                "AND to_tsvector('simple', translate("
+                "  title || ' ' || text, 'ёЁ', 'еЕ'"
+                ")) @@ to_tsquery('simple', %s) "
+                "ORDER BY id DESC LIMIT %s OFFSET %s",
+                (author_id, match, limit, offset),
+            )
+            return [pk for pk, in cursor.fetchall()]
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'postgresql': PostgreSQLBackend,
+}
+
+
+def get_backend(using):
+    connection = connections[using]
+    return BACKENDS[connection.vendor](connection)
+
+
+def index_notes(notes, using):
+    """Добавляет заметки в индекс или обновляет их."""
+    get_backend(using).index(notes)
+
+
+def remove_notes(pks, using):
+    get_backend(using).remove(pks)
+
+
+def search(queryset, author_id, query, page=1):
+    """
+    Страница заметок автора author_id, в которых есть слова,
+    начинающиеся со всех слов запроса. Новые заметки идут первыми.
+
+    Заметки загружаются из queryset. Возвращает список заметок
+    и признак наличия следующей страницы.
+    """
+    words = get_words(query)[:MAX_TERMS]
+    if not words:
+        return [], False
+    limit = settings.NOTES_SEARCH_RESULTS_ON_PAGE
+    pks = get_backend(queryset.db).search(
+        author_id, words, limit + 1, (page - 1) * limit
+    )
+    notes = queryset.in_bulk(pks[:limit])
+    # Заметка могла быть удалена между двумя запросами.
+    return [notes[pk] for pk in pks[:limit] if pk in notes], len(pks) > limit
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common import metrics
+
+from . import search
+from .models import Note
+
+# Поля заметки, из которых строится поисковый индекс.
+SEARCH_FIELDS = {'title', 'text', 'author', 'author_id'}
+
+
+@receiver(post_save, sender=Note)
+def count_note_saved(sender, created, **kwargs):
+    metrics.inc('note_writes_total',
+                action='created' if created else 'updated')
+
+
+@receiver(post_delete, sender=Note)
+def count_note_deleted(sender, **kwargs):
+    metrics.inc('note_writes_total', action='deleted')
+
+
+@receiver(post_save, sender=Note)
+def index_note(sender, instance, using, update_fields, **kwargs):
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        search.index_notes([instance], using)
+
+
+@receiver(post_delete, sender=Note)
+def remove_note_from_index(sender, instance, using, **kwargs):
+    search.remove_notes([instance.pk], using)
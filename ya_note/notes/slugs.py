@@ -0,0 +1,75 @@
+import re
+from functools import lru_cache
+
+from django.db.models import BooleanField, Case, Q, When
+from django.db.models.functions import Length
+from pytils.translit import slugify
+
+# Место под числовой суффикс вида «-N» в slug максимальной длины.
+SUFFIX_LENGTH = 10
+
+
+@lru_cache(maxsize=1024)
+def title_to_slug(title):
+    """Транслитерация заголовка в slug, результат кэшируется."""
+    return slugify(title)
+
+
+def _slug_usage(title, exclude_pk=None):
+    """
+    Возвращает slug из заголовка, префикс для суффикса «-N»,
+    признак занятости slug и следующий за максимальным занятым номер.
+
+    Занятые варианты ищутся одним запросом по диапазону
+    уникального индекса slug.
+    """
+    from .models import Note
+
+    max_length = Note._meta.get_field('slug').max_length
+    slug = title_to_slug(title)[:max_length]
+    prefix = slug[:max_length - SUFFIX_LENGTH] + '-'
+    # Все строки, начинающиеся с prefix, лежат в диапазоне
+    # [prefix, prefix с последним символом «.»), так как «.» следует за «-».
+    numbered = Q(
+        slug__gt=prefix,
+        slug__lt=prefix[:-1] + '.',
+        slug__regex=rf'^{re.escape(prefix)}[0-9]+$',
+    )
+    taken = Note.objects.filter(Q(slug=slug) | numbered)
+    if exclude_pk is not None:
+        taken = taken.exclude(pk=exclude_pk)
+    # Сначала сам slug из заголовка, если он занят, затем занятые
+    # варианты с суффиксом от большего номера к меньшему.
+    rows = list(taken.annotate(
+        is_base=Case(
+            When(slug=slug, then=True),
+            default=False,
+            output_field=BooleanField(),
+        ),
+        length=Length('slug'),
+    ).order_by('-is_base', '-length', '-slug').values_list(
+        'slug', flat=True
+    )[:2])
+    base_taken = bool(rows) and rows[0] == slug
+    if base_taken:
+        rows = rows[1:]
+    number = int(rows[0][len(prefix):]) + 1 if rows else 2
+    return slug, prefix, base_taken, number
+
+
+def allocate_slug(title, exclude_pk=None):
+    """
+    Возвращает свободный slug для заметки с указанным заголовком.
+
+    Если slug из заголовка занят, к нему добавляется суффикс «-N»
+    со следующим за максимальным занятым номером.
+    """
+    slug, prefix, base_taken, number = _slug_usage(title, exclude_pk)
+    if not base_taken:
+        return slug
+    return f'{prefix}{number}'
+
+
+def next_slug_number(title):
+    """Следующий за максимальным занятым номер суффикса «-N» для заголовка."""
+    return _slug_usage(title)[3]
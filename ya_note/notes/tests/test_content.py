@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from http import HTTPStatus
@@ -70,3 +70,49 @@ class TestContent(TestCase):
         self.assertIn('form', response.context)
         form = response.context['form']
         self.assertIsInstance(form, NoteForm)
+
+    def test_notes_list_defers_text(self):
+        """Список заметок не загружает текст заметок."""
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('notes:list'))
+        for note in response.context['object_list']:
+            self.assertIn('text', note.get_deferred_fields())
+
+    @override_settings(NOTES_COUNT_ON_LIST_PAGE=2)
+    def test_notes_list_is_paginated(self):
+        """
+        Список заметок листается курсором в порядке создания,
+        без пропусков и повторов.
+        """
+        Note.objects.bulk_create(
+            Note(title=f'Заметка {index}', text='Текст',
+                 slug=f'note-{index}', author=self.author)
+            for index in range(3)
+        )
+        expected = list(Note.objects.filter(
+            author=self.author
+        ).order_by('id').values_list('id', flat=True))
+        self.client.force_login(self.author)
+        url = reverse('notes:list')
+        loaded = []
+        params = {}
+        for page in (1, 2):
+            with self.subTest(page=page):
+                response = self.client.get(url, params)
+                object_list = response.context['object_list']
+                self.assertLessEqual(len(object_list), 2)
+                loaded += [note.id for note in object_list]
+                params = {'after': response.context['next_cursor']}
+        self.assertEqual(loaded, expected)
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_notes_list_wrong_cursor(self):
+        self.client.force_login(self.author)
+        for cursor in ('abc', '100000000000000000000'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(
+                    reverse('notes:list'), {'after': cursor}
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_FOUND
+                )
@@ -0,0 +1,12 @@
+from django.db import connection
+from django.test import TestCase
+
+
+class TestSQLitePragmas(TestCase):
+
+    def test_sqlite_pragmas_applied(self):
+        """PRAGMA из настроек выполняются при открытии соединения."""
+        for pragma, expected in (('synchronous', 1), ('busy_timeout', 5000)):
+            with self.subTest(pragma=pragma), connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA {pragma}')
+                self.assertEqual(cursor.fetchone()[0], expected)
@@ -1,10 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytils.translit import slugify as translit_slugify
 from http import HTTPStatus
+from io import StringIO
 
 from notes.models import Note
+from notes.slugs import allocate_slug
 
 User = get_user_model()
 
@@ -77,6 +82,72 @@ class NoteTests(TestCase):
         expected_slug = translit_slugify(data['title'])
         self.assertEqual(created_note.slug, expected_slug)
 
+    def test_create_note_does_not_check_slug_before_insert(self):
+        """Уникальность slug проверяет БД, без отдельного запроса."""
+        self.client.force_login(self.author)
+        data = {'title': 'Заголовок 4',
+                'text': 'Текст заметки',
+                'slug': 'new_slug'}
+        with CaptureQueriesContext(connection) as context:
+            self.client.post(reverse('notes:add'), data=data)
+        note_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'notes_note' in query['sql']
+        ]
+        self.assertEqual(note_selects, [])
+        self.assertTrue(Note.objects.filter(slug=data['slug']).exists())
+
+    def test_generated_slug_gets_numeric_suffix(self):
+        """Если slug, сформированный из заголовка, занят,
+        к нему добавляется числовой суффикс."""
+        self.client.force_login(self.author)
+        data = {'title': 'Заголовок', 'text': 'Текст заметки'}
+        slug = translit_slugify(data['title'])
+        Note.objects.create(slug=slug, author=self.author, **data)
+        response = self.client.post(reverse('notes:add'), data=data)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertTrue(Note.objects.filter(slug=f'{slug}-2').exists())
+
+    def test_generated_slugs_for_repeated_title(self):
+        """Заметки с одинаковым заголовком получают slug
+        со следующим свободным номером."""
+        slug = translit_slugify('Встреча')
+        Note.objects.create(title='Встреча', text='Текст',
+                            slug=f'{slug}-old', author=self.author)
+        slugs = [
+            Note.objects.create(
+                title='Встреча', text='Текст', author=self.author
+            ).slug
+            for _ in range(3)
+        ]
+        self.assertEqual(slugs, [slug, f'{slug}-2', f'{slug}-3'])
+        Note.objects.filter(slug=f'{slug}-2').delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(allocate_slug('Встреча'), f'{slug}-4')
+
+    def test_free_base_slug_preferred_over_suffix(self):
+        """Свободный slug из заголовка выдаётся, даже если
+        заняты варианты с суффиксом."""
+        slug = translit_slugify('Встреча')
+        Note.objects.create(title='Встреча', text='Текст',
+                            slug=f'{slug}-2', author=self.author)
+        with self.assertNumQueries(1):
+            self.assertEqual(allocate_slug('Встреча'), slug)
+        Note.objects.create(title='Встреча', text='Текст',
+                            slug=slug, author=self.author)
+        self.assertEqual(allocate_slug('Встреча'), f'{slug}-3')
+
+    def test_generate_notes_creates_unique_slugs(self):
+        """Команда generate_notes не конфликтует с уже занятыми slug."""
+        notes_before = Note.objects.count()
+        call_command('generate_notes', users=3, notes=200,
+                     title_collisions=0.5, batch_size=50, seed=1,
+                     stdout=StringIO())
+        self.assertEqual(Note.objects.count(), notes_before + 200)
+        slugs = Note.objects.values_list('slug', flat=True)
+        self.assertEqual(len(set(slugs)), len(slugs))
+
     def test_logged_in_user_can_edit_note(self):
         """Залогиненный пользователь может редактировать свою заметку."""
         self.client.force_login(self.author)
@@ -0,0 +1,90 @@
+import json
+from http import HTTPStatus
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from common import metrics
+from notes.models import Note
+
+User = get_user_model()
+
+LIST_REQUESTS = (
+    'http_requests_total{method="GET",status="200",view="notes:list"}'
+)
+NOTES_CREATED = 'note_writes_total{action="created"}'
+
+
+class TestMetrics(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def get_metric(self, sample):
+        """Значение метрики sample со страницы /metrics."""
+        response = self.client.get(reverse('metrics'))
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        for line in response.content.decode().splitlines():
+            name, _, value = line.rpartition(' ')
+            if name == sample:
+                return float(value)
+        return 0
+
+    def test_request_metrics(self):
+        """Запросы к странице попадают в счётчик и гистограммы."""
+        before = self.get_metric(LIST_REQUESTS)
+        self.client.get(reverse('notes:list'))
+        self.assertEqual(self.get_metric(LIST_REQUESTS), before + 1)
+        text = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn(
+            'db_queries_per_request_bucket{view="notes:list",le="+Inf"}',
+            text,
+        )
+
+    def test_note_writes_counter(self):
+        """Создание заметки увеличивает счётчик записей."""
+        before = self.get_metric(NOTES_CREATED)
+        Note.objects.create(title='Заголовок', text='Текст',
+                            author=self.author)
+        self.assertEqual(self.get_metric(NOTES_CREATED), before + 1)
+
+    def test_bulk_created_notes_counted(self):
+        """Заметки из bulk_create тоже попадают в счётчик записей."""
+        before = self.get_metric(NOTES_CREATED)
+        Note.objects.bulk_create(
+            Note(title='Заголовок', text='Текст', slug=f'bulk-{index}',
+                 author=self.author)
+            for index in range(3)
+        )
+        self.assertEqual(self.get_metric(NOTES_CREATED), before + 3)
+
+    def test_metrics_are_summed_across_processes(self):
+        """Значения из файлов других процессов суммируются."""
+        with TemporaryDirectory() as directory, override_settings(
+            METRICS_DIR=directory
+        ):
+            before = self.get_metric(LIST_REQUESTS)
+            (Path(directory) / 'other.json').write_text(json.dumps({
+                'types': {'http_requests_total': 'counter'},
+                'values': [['http_requests_total',
+                            [['method', 'GET'], ['status', '200'],
+                             ['view', 'notes:list']], 5]],
+            }))
+            self.assertEqual(self.get_metric(LIST_REQUESTS), before + 5)
+            self.assertTrue(
+                (Path(directory) / f'{metrics._process["id"]}.json').exists()
+            )
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_metrics_disabled(self):
+        """Отключённые метрики не отдаются."""
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+class TestProfiling(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', author=cls.author
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def test_profiling_disabled_by_default(self):
+        """Без PROFILING_ENABLED заголовок Server-Timing не добавляется."""
+        response = self.client.get(reverse('notes:list'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_server_timing_header(self):
+        """В Server-Timing есть время запроса, SQL и шаблона."""
+        response = self.client.get(reverse('notes:list'))
+        timing = response['Server-Timing']
+        for metric in ('app;dur=', 'db;dur=', 'slow;dur=', 'tpl;dur='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, timing)
+        self.assertNotIn('"0 queries"', timing)
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_SLOW_QUERIES=1)
+    def test_slowest_queries_are_logged(self):
+        """Самые медленные запросы к БД пишутся в лог."""
+        with self.assertLogs('common.middleware', 'INFO') as logs:
+            response = self.client.get(reverse('notes:list'))
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        self.assertIn('SELECT', logs.records[0].getMessage())
+        self.assertIn('"0 slow queries"', response['Server-Timing'])
+
+    @override_settings(
+        PROFILING_ENABLED=True, PROFILING_SLOW_QUERY_THRESHOLD=0
+    )
+    def test_slow_queries_in_server_timing(self):
+        """
+        Запросы дольше порога считаются в Server-Timing
+        и пишутся в лог как предупреждения.
+        """
+        with self.assertLogs('common.middleware', 'INFO') as logs:
+            response = self.client.get(reverse('notes:list'))
+        self.assertNotIn('"0 slow queries"', response['Server-Timing'])
+        self.assertEqual(
+            {record.levelname for record in logs.records}, {'WARNING'}
+        )
+
+    def test_cprofile_dump(self):
+        """Профиль сохраняется для запросов дольше порога."""
+        with TemporaryDirectory() as directory, override_settings(
+            PROFILING_ENABLED=True,
+            PROFILING_CPROFILE_DIR=directory,
+            PROFILING_CPROFILE_RATE=1,
+            PROFILING_CPROFILE_THRESHOLD=0,
+        ):
+            self.client.get(reverse('notes:detail', args=(self.note.slug,)))
+            dumps = list(Path(directory).glob('*.prof'))
+        self.assertEqual(len(dumps), 1)
+        self.assertIn('notes-detail', dumps[0].name)
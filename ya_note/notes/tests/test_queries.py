@@ -0,0 +1,201 @@
+import json
+from functools import wraps
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+# Объёмы данных, на которых проверяется число запросов представлений.
+QUERY_BUDGET_SIZES = (1, 10, 1000)
+# Сессия и пользователь загружаются в каждом запросе
+# авторизованного пользователя.
+AUTH_QUERIES = 2
+# Сохранение заметки выполняется в транзакции: внутри теста
+# это SAVEPOINT и RELEASE SAVEPOINT.
+SAVEPOINT_QUERIES = 2
+# Запись заметки в поисковый индекс или удаление из него.
+SEARCH_INDEX_QUERIES = 1
+# Размер пачки выгрузки и импорта в тестах: 1000 заметок - 10 пачек.
+TRANSFER_BATCH_SIZE = 100
+# Пачка импорта: занятые slug, вставка заметок в транзакции bulk_create,
+# их id и запись в поисковый индекс.
+IMPORT_BATCH_QUERIES = 3 + SAVEPOINT_QUERIES + SEARCH_INDEX_QUERIES
+
+
+def query_budget(queries):
+    """
+    Декоратор теста с бюджетом запросов.
+
+    Тест готовит данные и возвращает функцию, выполняющую запрос
+    к представлению. Она вызывается для каждого объёма заметок из
+    QUERY_BUDGET_SIZES и каждый раз должна выполнить ровно queries
+    запросов к БД.
+    """
+    def decorator(test):
+        @wraps(test)
+        def wrapper(self):
+            for size in QUERY_BUDGET_SIZES:
+                self.fill_notes(size)
+                make_request = test(self)
+                with self.subTest(size=size), self.assertNumQueries(queries):
+                    make_request()
+        return wrapper
+    return decorator
+
+
+class TestQueryBudget(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Лев Толстой')
+        cls.reader = User.objects.create(username='Читатель простой')
+        cls.note = Note.objects.create(
+            title='Заголовок',
+            text='Текст заметки',
+            slug='note-slug',
+            author=cls.author,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def fill_notes(self, size):
+        """Доводит число заметок автора и читателя до size."""
+        for user in (self.author, self.reader):
+            count = Note.objects.filter(author=user).count()
+            Note.objects.bulk_create(
+                Note(title=f'Заметка {index}', text='Текст',
+                     slug=f'{user.pk}-{index}', author=user)
+                for index in range(count, size)
+            )
+
+    def get(self, name, args=None):
+        url = reverse(name, args=args)
+        return lambda: self.client.get(url)
+
+    def post(self, name, args=None, data=None):
+        url = reverse(name, args=args)
+        return lambda: self.client.post(url, data)
+
+    @query_budget(AUTH_QUERIES)
+    def test_home(self):
+        return self.get('notes:home')
+
+    @query_budget(AUTH_QUERIES)
+    def test_success(self):
+        return self.get('notes:success')
+
+    @query_budget(AUTH_QUERIES + 1)
+    def test_list(self):
+        """Порция заметок без подсчёта их общего числа."""
+        return self.get('notes:list')
+
+    @query_budget(AUTH_QUERIES + 1)
+    def test_list_after_cursor(self):
+        url = reverse('notes:list')
+        return lambda: self.client.get(url, {'after': self.note.pk})
+
+    @query_budget(AUTH_QUERIES + 2)
+    def test_search(self):
+        """Поиск по индексу и загрузка найденных заметок."""
+        url = reverse('notes:search')
+        return lambda: self.client.get(url, {'q': 'замет'})
+
+    @query_budget(AUTH_QUERIES + 1)
+    def test_detail(self):
+        return self.get('notes:detail', (self.note.slug,))
+
+    @query_budget(AUTH_QUERIES)
+    def test_add_page(self):
+        return self.get('notes:add')
+
+    @query_budget(
+        AUTH_QUERIES + 1 + SAVEPOINT_QUERIES + SEARCH_INDEX_QUERIES
+    )
+    def test_add(self):
+        """Вставка заметки без проверки slug отдельным запросом."""
+        slug = f'new-{Note.objects.count()}'
+        return self.post(
+            'notes:add', data={'title': 'Заголовок', 'text': 'Текст',
+                               'slug': slug}
+        )
+
+    @query_budget(
+        AUTH_QUERIES + 2 + SAVEPOINT_QUERIES + SEARCH_INDEX_QUERIES
+    )
+    def test_add_with_generated_slug(self):
+        """Подбор slug по заголовку и вставка заметки."""
+        return self.post(
+            'notes:add', data={'title': 'Заголовок', 'text': 'Текст'}
+        )
+
+    @query_budget(AUTH_QUERIES + 1)
+    def test_edit_page(self):
+        return self.get('notes:edit', (self.note.slug,))
+
+    @query_budget(
+        AUTH_QUERIES + 2 + SAVEPOINT_QUERIES + SEARCH_INDEX_QUERIES
+    )
+    def test_edit(self):
+        """Заметка и её обновление."""
+        return self.post(
+            'notes:edit', (self.note.slug,),
+            {'title': 'Заголовок', 'text': 'Новый текст',
+             'slug': self.note.slug}
+        )
+
+    @query_budget(AUTH_QUERIES + 1)
+    def test_delete_page(self):
+        return self.get('notes:delete', (self.note.slug,))
+
+    @query_budget(AUTH_QUERIES + 2 + SEARCH_INDEX_QUERIES)
+    def test_delete(self):
+        """Заметка и её удаление."""
+        note = Note.objects.create(
+            title='Заголовок', text='Текст', author=self.author
+        )
+        return self.post('notes:delete', (note.slug,))
+
+    @mock.patch('notes.transfer.EXPORT_CHUNK_SIZE', TRANSFER_BATCH_SIZE)
+    @query_budget(AUTH_QUERIES + 1)
+    def test_export(self):
+        """Все пачки выгрузки читаются из одного запроса."""
+        url = reverse('notes:export')
+
+        def export():
+            response = self.client.get(url, {'format': 'csv'})
+            b''.join(response.streaming_content)
+        return export
+
+    @mock.patch('notes.transfer.IMPORT_BATCH_SIZE', TRANSFER_BATCH_SIZE)
+    def test_import(self):
+        """Число запросов растёт с числом пачек, а не строк."""
+        url = reverse('notes:import')
+        for size in QUERY_BUDGET_SIZES:
+            rows = ''.join(
+                json.dumps({'title': f'Импорт {size} {index}',
+                            'text': 'Текст'}) + '\n'
+                for index in range(size)
+            )
+            batches = -(-size // TRANSFER_BATCH_SIZE)
+            # Весь импорт выполняется в одной транзакции.
+            with self.subTest(size=size), self.assertNumQueries(
+                AUTH_QUERIES + SAVEPOINT_QUERIES
+                + IMPORT_BATCH_QUERIES * batches
+            ):
+                self.client.post(url, {
+                    'format': 'ndjson',
+                    'file': SimpleUploadedFile('notes.ndjson',
+                                               rows.encode()),
+                })
+            self.assertEqual(
+                Note.objects.filter(title__startswith=f'Импорт {size} ')
+                .count(),
+                size,
+            )
@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from http import HTTPStatus
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+class TestSearch(TestCase):
+    URL = reverse('notes:search')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Лев Толстой')
+        cls.reader = User.objects.create(username='Читатель простой')
+        cls.note = Note.objects.create(
+            title='Встреча с издателем',
+            text='Обсудить тираж и ещё обложку',
+            slug='meeting',
+            author=cls.author,
+        )
+        cls.other_note = Note.objects.create(
+            title='Встреча с читателями',
+            text='Взять книги',
+            slug='readers',
+            author=cls.reader,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def search(self, query, **params):
+        response = self.client.get(self.URL, {'q': query, **params})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.context['notes']
+
+    def test_anonymous_user_redirected_to_login(self):
+        self.client.logout()
+        response = self.client.get(self.URL)
+        self.assertRedirects(
+            response, reverse('users:login') + '?next=' + self.URL
+        )
+
+    def test_prefix_search(self):
+        """Слова ищутся по началу в заголовке и тексте."""
+        for query in ('в', 'встр', 'Встреча', 'тир', 'изд обл', 'ЕЩЕ'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query), [self.note])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.search('встреча книги'), [])
+
+    def test_only_own_notes_found(self):
+        """Заметки другого пользователя не находятся."""
+        self.assertEqual(self.search('читател'), [])
+        self.client.force_login(self.reader)
+        self.assertEqual(self.search('встреча'), [self.other_note])
+
+    def test_empty_query(self):
+        for query in ('', '  ', '!?'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query), [])
+
+    def test_wrong_page(self):
+        for page in ('0', '51', 'abc'):
+            with self.subTest(page=page):
+                response = self.client.get(
+                    self.URL, {'q': 'встреча', 'page': page}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @override_settings(NOTES_SEARCH_RESULTS_ON_PAGE=2)
+    def test_pages(self):
+        """Новые заметки идут первыми, страницы выводятся по порядку."""
+        notes = [
+            Note.objects.create(title=f'Встреча {index}', text='Текст',
+                                author=self.author)
+            for index in range(3)
+        ]
+        response = self.client.get(self.URL, {'q': 'встреча'})
+        self.assertEqual(response.context['notes'], notes[:0:-1])
+        self.assertTrue(response.context['has_next'])
+        response = self.client.get(self.URL, {'q': 'встреча', 'page': 2})
+        self.assertEqual(response.context['notes'], [notes[0], self.note])
+        self.assertFalse(response.context['has_next'])
+
+    def test_index_updated_on_create(self):
+        self.client.post(
+            reverse('notes:add'), {'title': 'Позвонить', 'text': 'Маме'}
+        )
+        self.assertEqual(
+            self.search('позв мам'), [Note.objects.get(title='Позвонить')]
+        )
+
+    def test_index_updated_on_edit(self):
+        self.client.post(
+            reverse('notes:edit', args=(self.note.slug,)),
+            {'title': 'Звонок', 'text': 'Издателю', 'slug': self.note.slug},
+        )
+        self.assertEqual(self.search('встреча'), [])
+        self.assertEqual(self.search('звонок издател'), [self.note])
+
+    def test_index_updated_on_delete(self):
+        self.client.post(reverse('notes:delete', args=(self.note.slug,)))
+        self.assertEqual(self.search('встреча'), [])
+
+    def test_bulk_created_notes_indexed(self):
+        notes = Note.objects.bulk_create(
+            Note(title='Покупки', text=f'Список {index}', slug=f'buy-{index}',
+                 author=self.author)
+            for index in range(3)
+        )
+        self.assertTrue(all(note.pk for note in notes))
+        self.assertEqual(self.search('покупки спис'), notes[::-1])
+        self.assertEqual(self.search('список 1'), [notes[1]])
@@ -0,0 +1,212 @@
+import csv
+import json
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+from notes.search import search
+
+User = get_user_model()
+
+
+class TestExport(TestCase):
+    URL = reverse('notes:export')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Лев Толстой')
+        cls.reader = User.objects.create(username='Читатель простой')
+        cls.notes = [
+            Note.objects.create(title=f'Заметка {index}',
+                                text='Текст, "с кавычками"\nи строками',
+                                slug=f'note-{index}', author=cls.author)
+            for index in range(3)
+        ]
+        Note.objects.create(title='Чужая', text='Текст', slug='other',
+                            author=cls.reader)
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def export(self, name):
+        response = self.client.get(self.URL, {'format': name})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response['Content-Disposition'],
+            f'attachment; filename="notes.{name}"',
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def expected(self):
+        return [
+            {'title': note.title, 'text': note.text, 'slug': note.slug}
+            for note in self.notes
+        ]
+
+    def test_anonymous_user_redirected_to_login(self):
+        self.client.logout()
+        response = self.client.get(self.URL)
+        self.assertRedirects(
+            response, reverse('users:login') + '?next=' + self.URL
+        )
+
+    def test_ndjson(self):
+        """Выгружаются только заметки пользователя, по одной в строке."""
+        content = self.export('ndjson')
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            self.expected(),
+        )
+
+    def test_csv(self):
+        content = self.export('csv')
+        self.assertEqual(
+            list(csv.DictReader(content.splitlines(keepends=True))),
+            self.expected(),
+        )
+
+    def test_wrong_format(self):
+        response = self.client.get(self.URL, {'format': 'xml'})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @mock.patch('notes.transfer.EXPORT_CHUNK_SIZE', 2)
+    def test_streamed_by_chunks(self):
+        """Заметки отдаются пачками, а не одним куском."""
+        response = self.client.get(self.URL)
+        self.assertEqual(len(list(response.streaming_content)), 2)
+
+
+class TestImport(TestCase):
+    URL = reverse('notes:import')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Лев Толстой')
+        cls.note = Note.objects.create(
+            title='Встреча', text='Текст', slug='vstrecha', author=cls.author
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def upload(self, rows, name='ndjson'):
+        if name == 'ndjson':
+            content = '\n'.join(
+                row if isinstance(row, str)
+                else json.dumps(row, ensure_ascii=False)
+                for row in rows
+            )
+        else:
+            content = '\n'.join(rows)
+        response = self.client.post(self.URL, {
+            'format': name,
+            'file': SimpleUploadedFile(f'notes.{name}', content.encode()),
+        })
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response
+
+    def test_anonymous_user_cannot_import(self):
+        self.client.logout()
+        response = self.client.post(self.URL)
+        self.assertRedirects(
+            response, reverse('users:login') + '?next=' + self.URL
+        )
+
+    def test_ndjson(self):
+        """Slug из заголовков подбираются с учётом БД и самого файла."""
+        response = self.upload([
+            {'title': 'Встреча', 'text': 'Первая'},
+            {'title': 'Встреча', 'text': 'Вторая'},
+            {'title': 'Идеи', 'text': 'Третья', 'slug': 'ideas'},
+            {'title': 'Позвонить', 'text': 'Четвёртая'},
+        ])
+        self.assertEqual(response.context['importer'].created, 4)
+        self.assertEqual(
+            list(Note.objects.filter(author=self.author).order_by(
+                'id'
+            ).values_list('text', 'slug')),
+            [('Текст', 'vstrecha'), ('Первая', 'vstrecha-2'),
+             ('Вторая', 'vstrecha-3'), ('Третья', 'ideas'),
+             ('Четвёртая', 'pozvonit')],
+        )
+
+    def test_suffix_after_taken_numbered_slug(self):
+        """Если slug из заголовка свободен в БД, но занят вариант
+        с суффиксом, повтор заголовка в файле получает следующий номер."""
+        Note.objects.create(title='Идеи', text='Текст', slug='idei-2',
+                            author=self.author)
+        self.upload([
+            {'title': 'Идеи', 'text': 'Первая'},
+            {'title': 'Идеи', 'text': 'Вторая'},
+        ])
+        self.assertEqual(
+            list(Note.objects.filter(text__in=['Первая', 'Вторая']).order_by(
+                'id'
+            ).values_list('slug', flat=True)),
+            ['idei', 'idei-3'],
+        )
+
+    def test_csv(self):
+        response = self.upload(
+            ['title,text,slug', 'Идеи,"Текст, с запятой",', 'Дела,Текст,'],
+            'csv',
+        )
+        self.assertEqual(response.context['importer'].created, 2)
+        self.assertTrue(Note.objects.filter(
+            slug='idei', text='Текст, с запятой'
+        ).exists())
+
+    def test_imported_notes_searchable(self):
+        self.upload([{'title': 'Покупки', 'text': 'Молоко'}])
+        notes, has_next = search(
+            Note.objects.all(), self.author.pk, 'покуп мол'
+        )
+        self.assertEqual(notes, [Note.objects.get(slug='pokupki')])
+
+    def test_errors_reported_and_nothing_created(self):
+        """При ошибках ни одна заметка не создаётся."""
+        count = Note.objects.count()
+        response = self.upload([
+            {'title': 'Идеи', 'text': 'Правильная строка'},
+            'не json',
+            {'title': 'Без текста'},
+            {'title': 'Занятый', 'text': 'Текст', 'slug': 'vstrecha'},
+            {'title': 'Новый', 'text': 'Текст', 'slug': 'same'},
+            {'title': 'Повтор', 'text': 'Текст', 'slug': 'same'},
+            {'title': 'Плохой', 'text': 'Текст', 'slug': 'не slug'},
+        ])
+        importer = response.context['importer']
+        self.assertEqual(Note.objects.count(), count)
+        self.assertEqual(importer.error_count, 5)
+        self.assertEqual(
+            [line for line, messages in importer.errors], [2, 3, 4, 6, 7]
+        )
+        self.assertContains(response, 'Строка 4')
+
+    def test_batch_queries_do_not_depend_on_rows(self):
+        """Slug для пачки заметок проверяются и подбираются вместе."""
+        def count_queries(rows):
+            with CaptureQueriesContext(connection) as queries:
+                self.upload([
+                    {'title': f'Заметка {rows} {index}', 'text': 'Текст'}
+                    for index in range(rows)
+                ])
+            return len(queries)
+
+        self.assertEqual(count_queries(10), count_queries(100))
+
+    def test_not_utf8(self):
+        response = self.client.post(self.URL, {
+            'format': 'ndjson',
+            'file': SimpleUploadedFile('notes.ndjson',
+                                       'Заметка'.encode('cp1251')),
+        })
+        self.assertFalse(response.context['form'].is_valid())
@@ -0,0 +1,186 @@
+"""
+Выгрузка и загрузка заметок в NDJSON и CSV.
+
+Выгрузка читает заметки из БД пачками по EXPORT_CHUNK_SIZE
+(в PostgreSQL - серверным курсором) и сразу отдаёт каждую пачку
+клиенту, поэтому память не зависит от числа заметок.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from .forms import WARNING, NoteImportForm
+from .models import Note
+from .slugs import SUFFIX_LENGTH, next_slug_number, title_to_slug
+
+FIELDS = ('title', 'text', 'slug')
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 1000
+# Сколько ошибок показывать в отчёте об импорте.
+MAX_REPORTED_ERRORS = 100
+
+
+def export_chunks(queryset):
+    """Пачки заметок в виде кортежей со значениями FIELDS."""
+    rows = queryset.order_by('id').values_list(*FIELDS).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_ndjson(queryset):
+    for chunk in export_chunks(queryset):
+        yield ''.join(
+            json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + '\n'
+            for row in chunk
+        )
+
+
+def export_csv(queryset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(FIELDS)
+    yield flush()
+    for chunk in export_chunks(queryset):
+        writer.writerows(chunk)
+        yield flush()
+
+
+# Формат: функция выгрузки и тип содержимого.
+EXPORT_FORMATS = {
+    'ndjson': (export_ndjson, 'application/x-ndjson'),
+    'csv': (export_csv, 'text/csv'),
+}
+
+
+def read_ndjson(file):
+    """Пары (номер строки, данные заметки) из файла NDJSON."""
+    for line, text in enumerate(file, 1):
+        if not text.strip():
+            continue
+        try:
+            yield line, json.loads(text)
+        except ValueError:
+            yield line, None
+
+
+def read_csv(file):
+    """Пары (номер строки, данные заметки) из файла CSV с заголовком."""
+    reader = csv.DictReader(file)
+    for data in reader:
+        yield reader.line_num, data
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+class NoteImporter:
+    """
+    Импорт заметок автора пачками по IMPORT_BATCH_SIZE.
+
+    Каждая строка проверяется NoteImportForm. Занятость slug
+    проверяется одним запросом на пачку, там же подбираются slug
+    для строк без него; next_slug_number вызывается только для заголовков,
+    slug которых уже занят. Ошибки собираются по номерам строк,
+    при ошибках вызывающий код откатывает транзакцию.
+    """
+
+    def __init__(self, author):
+        self.author = author
+        self.created = 0
+        self.errors = []
+        self.error_count = 0
+        self.batch = []
+        # Slug, уже выданные заметкам этого импорта.
+        self.used = set()
+        # Следующий номер суффикса для занятых slug из заголовков.
+        self.next_numbers = {}
+        self.max_length = Note._meta.get_field('slug').max_length
+
+    def run(self, rows):
+        for line, data in rows:
+            self.add(line, data)
+        self.flush()
+        self.errors.sort()
+
+    def add(self, line, data):
+        if not isinstance(data, dict):
+            self.add_error(line, ['Строка не содержит полей заметки.'])
+            return
+        form = NoteImportForm(
+            data={field: data.get(field) for field in FIELDS}
+        )
+        if not form.is_valid():
+            self.add_error(line, [
+                f'{form.fields[field].label}: {message}'
+                if field in form.fields else message
+                for field, messages in form.errors.items()
+                for message in messages
+            ])
+            return
+        form.instance.author = self.author
+        self.batch.append((line, form.instance, form.slug_generated))
+        if len(self.batch) >= IMPORT_BATCH_SIZE:
+            self.flush()
+
+    def add_error(self, line, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, messages))
+
+    def base_slug(self, title):
+        return title_to_slug(title)[:self.max_length]
+
+    def free_slug(self, title, taken):
+        slug = self.base_slug(title)
+        if slug not in taken and slug not in self.used:
+            return slug
+        prefix = slug[:self.max_length - SUFFIX_LENGTH] + '-'
+        number = self.next_numbers.get(slug)
+        if number is None:
+            number = next_slug_number(title)
+        while f'{prefix}{number}' in self.used:
+            number += 1
+        self.next_numbers[slug] = number + 1
+        return f'{prefix}{number}'
+
+    def flush(self):
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        wanted = {
+            self.base_slug(note.title) if generated else note.slug
+            for line, note, generated in batch
+        }
+        taken = set(Note.objects.filter(slug__in=wanted).values_list(
+            'slug', flat=True
+        ))
+        notes = []
+        for line, note, generated in batch:
+            if generated:
+                note.slug = self.free_slug(note.title, taken)
+            elif note.slug in taken or note.slug in self.used:
+                self.add_error(line, [
+                    f'{Note._meta.get_field("slug").verbose_name}: '
+                    f'{note.slug}{WARNING}'
+                ])
+                continue
+            self.used.add(note.slug)
+            notes.append(note)
+        Note.objects.bulk_create(notes)
+        self.created += len(notes)
@@ -1,9 +1,23 @@
+import csv
+import io
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError, transaction
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse_lazy
 from django.views import generic
 
-from .forms import NoteForm
+from .forms import WARNING, ImportForm, NoteForm
 from .models import Note
+from .pagination import get_notes_page
+from .search import search
+from .slugs import allocate_slug
+from .transfer import EXPORT_FORMATS, READERS, NoteImporter
+
+# Сколько раз подбирать slug заново, если подобранный по заголовку
+# slug успел занять параллельный запрос.
+SLUG_ATTEMPTS = 3
 
 
 class Home(generic.TemplateView):
@@ -26,22 +40,45 @@ class NoteBase(LoginRequiredMixin):
         return self.model.objects.filter(author=self.request.user)
 
 
-class NoteCreate(NoteBase, generic.CreateView):
-    """Добавление заметки."""
+class NoteFormMixin:
+    """
+    Сохранение заметки из формы.
+
+    Заметка сразу записывается в БД, нарушение уникальности slug
+    превращается в ошибку формы. Slug, сформированный из заголовка,
+    при конфликте подбирается заново.
+    """
     template_name = 'notes/form.html'
     form_class = NoteForm
 
     def form_valid(self, form):
-        new_note = form.save(commit=False)
-        new_note.author = self.request.user
-        new_note.save()
+        slug = form.instance.slug
+        for _ in range(SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return super().form_valid(form)
+            except IntegrityError as error:
+                if 'slug' not in str(error):
+                    raise
+                if not form.slug_generated:
+                    break
+                form.instance.slug = allocate_slug(
+                    form.cleaned_data['title'], exclude_pk=form.instance.pk
+                )
+        form.add_error('slug', slug + WARNING)
+        return self.form_invalid(form)
+
+
+class NoteCreate(NoteBase, NoteFormMixin, generic.CreateView):
+    """Добавление заметки."""
+
+    def form_valid(self, form):
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class NoteUpdate(NoteBase, generic.UpdateView):
+class NoteUpdate(NoteBase, NoteFormMixin, generic.UpdateView):
     """Редактирование заметки."""
-    template_name = 'notes/form.html'
-    form_class = NoteForm
 
 
 class NoteDelete(NoteBase, generic.DeleteView):
@@ -53,7 +90,109 @@ class NotesList(NoteBase, generic.ListView):
     """Список всех заметок пользователя."""
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        """
+        Порция заметок после курсора из параметра after.
+
+        Общее число заметок не считается. Текст заметок в списке
+        не выводится и не загружается.
+        """
+        try:
+            notes, self.next_cursor = get_notes_page(
+                super().get_queryset().only('id', 'title', 'slug'),
+                self.request.GET.get('after'),
+            )
+        except ValueError:
+            raise Http404('Некорректный курсор.')
+        return notes
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        return context
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+
+class NoteSearch(NoteBase, generic.TemplateView):
+    """
+    Поиск по заметкам пользователя.
+
+    Слова запроса ищутся по началу, поэтому поиск работает
+    по мере ввода. Общее число найденного не считается.
+    """
+    template_name = 'notes/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        try:
+            page = int(self.request.GET.get('page', 1))
+        except ValueError:
+            raise Http404
+        if not 1 <= page <= settings.NOTES_SEARCH_MAX_PAGE:
+            raise Http404
+        notes, has_next = search(
+            self.get_queryset().only('id', 'title', 'slug', 'text'),
+            self.request.user.pk, query, page,
+        )
+        context.update(
+            query=query, page=page, notes=notes, has_next=has_next,
+        )
+        return context
+
+
+class NoteExport(NoteBase, generic.View):
+    """Выгрузка всех заметок пользователя в NDJSON или CSV."""
+
+    def get(self, request, *args, **kwargs):
+        name = request.GET.get('format', 'ndjson')
+        if name not in EXPORT_FORMATS:
+            raise Http404
+        export, content_type = EXPORT_FORMATS[name]
+        response = StreamingHttpResponse(
+            export(self.get_queryset()),
+            content_type=f'{content_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="notes.{name}"'
+        )
+        return response
+
+
+class NoteImport(NoteBase, generic.FormView):
+    """
+    Импорт заметок из файла.
+
+    Заметки создаются в одной транзакции: если хотя бы одна строка
+    не прошла проверку, не создаётся ни одной, а в ответе
+    перечисляются ошибки по номерам строк.
+    """
+    template_name = 'notes/import.html'
+    form_class = ImportForm
+
+    def form_valid(self, form):
+        importer = NoteImporter(self.request.user)
+        rows = READERS[form.cleaned_data['format']](io.TextIOWrapper(
+            form.cleaned_data['file'], encoding='utf-8-sig', newline=''
+        ))
+        try:
+            with transaction.atomic():
+                importer.run(rows)
+                if importer.error_count:
+                    transaction.set_rollback(True)
+        except (UnicodeDecodeError, csv.Error):
+            form.add_error('file', 'Файл не удалось прочитать как '
+                                   'текст UTF-8 в выбранном формате.')
+            return self.form_invalid(form)
+        except IntegrityError:
+            # Slug занял параллельный запрос после проверки.
+            form.add_error(None, 'Заметки с такими slug только что '
+                                 'созданы, повторите импорт.')
+            return self.form_invalid(form)
+        return self.render_to_response(
+            self.get_context_data(form=form, importer=importer)
+        )
@@ -1,7 +1,10 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
 
+from common.database import get_database
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-yipnj$#j!ajarq%k55z4kuf3x79)91h0h42o9!1ho(z=!%mt=#'
@@ -22,6 +25,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'common.middleware.ProfilingMiddleware',
+    'common.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,10 +58,7 @@ WSGI_APPLICATION = 'yanote.wsgi.application'
 
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': get_database(BASE_DIR, 'yanote'),
 }
 
 
@@ -87,3 +89,35 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_COUNT_ON_LIST_PAGE = 20
+NOTES_SEARCH_RESULTS_ON_PAGE = 20
+NOTES_SEARCH_MAX_PAGE = 50
+
+# Профилирование запросов: заголовок Server-Timing и медленные
+# SQL-запросы в логе (логгер common.middleware). Профили cProfile
+# сохраняются, только если задан PROFILING_CPROFILE_DIR.
+PROFILING_ENABLED = False
+PROFILING_SLOW_QUERIES = 5
+PROFILING_SLOW_QUERY_THRESHOLD = 0.1
+PROFILING_CPROFILE_DIR = None
+PROFILING_CPROFILE_RATE = 0.1
+PROFILING_CPROFILE_THRESHOLD = 0.5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'common.middleware': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Метрики для /metrics, METRICS_ENABLED=0 отключает их. Когда
+# процессов несколько, METRICS_DIR должен указывать на общий для них
+# каталог; его стоит очищать при развёртывании.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 10